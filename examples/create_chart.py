@@ -2,7 +2,12 @@
 import sys
 import logging
 
-from pyganttccpm import plot_project_gantt  # Import the main function
+# Import the main functions
+from pyganttccpm import (
+    plot_project_gantt,
+    save_svg,
+    show_png,
+)
 from pyganttccpm.loader import load_process_project_data  # Import the loader
 
 # --- Basic Logging Configuration for the Application ---
@@ -11,6 +16,7 @@ logging.basicConfig(
     level=logging.INFO,  # Set the minimum level you want to see (e.g., INFO, DEBUG)
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
 )
+logger = logging.getLogger(__name__)
 # --- End Logging Configuration ---
 
 # --- Configuration ---
@@ -18,9 +24,12 @@ JSON_FILE_PATH = (
     './examples/project-gantt-data.json'  # Adjust path relative to example script
 )
 OUTPUT_SVG_FILE = '../gantt_chart_example.svg'  # Adjust path
+OUTPUT_PNG_FILE = '../gantt_chart_example.png'  # Used for large charts or --png
+PNG_TASK_THRESHOLD = 500  # Above this many tasks a PNG is much faster to write and view
+SHOW_PLOT = '--show' in sys.argv[1:]  # Display the chart after saving it
 
 # 1. Load Data using the loader function from the package
-logging.info(f'Loading data from {JSON_FILE_PATH}...')
+logger.info('Loading data from %s...', JSON_FILE_PATH)
 (
     project_start_date,
     tasks,
@@ -33,12 +42,12 @@ logging.info(f'Loading data from {JSON_FILE_PATH}...')
 ) = load_process_project_data(JSON_FILE_PATH)
 
 if tasks is None or project_start_date is None:
-    logging.info('Failed to load or process project data. Exiting.')
+    logger.info('Failed to load or process project data. Exiting.')
     sys.exit(1)
-logging.info('Data loaded successfully.')
+logger.info('Data loaded successfully.')
 
 # 2. Create the Gantt Plot using the main package function
-logging.info('Generating plot...')
+logger.info('Generating plot...')
 fig = plot_project_gantt(
     project_start_date,
     tasks,
@@ -51,24 +60,31 @@ fig = plot_project_gantt(
     add_start_end_nodes=False,
 )
 
-# 3. Save Plot to SVG File
+# 3. Save Plot to SVG File (or PNG for large charts)
+# SVG size and render time grow with the number of artists, PNG only with pixels
+if '--png' in sys.argv[1:] or len(tasks) > PNG_TASK_THRESHOLD:
+    output_file = OUTPUT_PNG_FILE
+else:
+    output_file = OUTPUT_SVG_FILE
 if fig:
     try:
-        logging.info(f'Saving plot to {OUTPUT_SVG_FILE}...')
-        fig.savefig(OUTPUT_SVG_FILE, format='svg', bbox_inches='tight')
-        logging.info('Plot saved successfully.')
+        logger.info('Saving plot to %s...', output_file)
+        if output_file == OUTPUT_PNG_FILE:
+            fig.savefig(output_file, format='png', dpi=150, bbox_inches='tight')
+        else:
+            save_svg(fig, output_file, bbox_inches='tight')
+        logger.info('Plot saved successfully.')
     except Exception as e:
-        logging.exception(f'Error saving plot to SVG: {e}')
+        logger.exception('Error saving plot to %s: %s', output_file, e)
 else:
-    logging.info('Plot figure was not generated, skipping save.')
-
-# 4. Optionally Show the Plot (if running interactively)
-import matplotlib.pyplot as plt
+    logger.info('Plot figure was not generated, skipping save.')
 
-if fig:
-    logging.info('Displaying plot...')
-    plt.show()
-else:
-    logging.info('Plot figure was not generated, skipping display.')
+# 4. Optionally Show the Plot (run with --show)
+# A low resolution PNG is displayed; the SVG file keeps full detail.
+if fig and SHOW_PLOT:
+    logger.info('Displaying plot...')
+    show_png(fig)
+elif not fig:
+    logger.info('Plot figure was not generated, skipping display.')
 
-logging.info('Example script finished.')
+logger.info('Example script finished.')
@@ -1,12 +1,15 @@
 # examples/create_chart_processed_data.py
 import sys
-from datetime import datetime, timedelta
-import matplotlib.pyplot as plt
 import logging
 
 
 # Import the processing and plotting functions
-from pyganttccpm import process_project_data, plot_project_gantt  # NEW
+from pyganttccpm import (
+    process_project_data,
+    plot_project_gantt,
+    save_svg,
+    show_png,
+)
 
 
 # --- Basic Logging Configuration for the Application ---
@@ -15,6 +18,7 @@ logging.basicConfig(
     level=logging.INFO,  # Set the minimum level you want to see (e.g., INFO, DEBUG)
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
 )
+logger = logging.getLogger(__name__)
 # --- End Logging Configuration ---
 
 
@@ -66,7 +70,7 @@ tasks_input = [
 ]
 
 # --- 2. Process the Raw Data using the package function ---
-logging.info('Processing raw data...')
+logger.info('Processing raw data...')
 (
     project_start_date,
     tasks,
@@ -93,13 +97,13 @@ logging.info('Processing raw data...')
 # )
 
 if tasks is None or project_start_date is None:
-    logging.info('Failed to process project data. Exiting.')
+    logger.info('Failed to process project data. Exiting.')
     sys.exit(1)
-logging.info('Data processed successfully.')
+logger.info('Data processed successfully.')
 
 # --- 3. Create the Gantt Plot using the main package function ---
-logging.info('Generating plot...')
-fig = plot_project_gantt_with_start_end(
+logger.info('Generating plot...')
+fig = plot_project_gantt(
     project_start_date,
     tasks,
     dependencies,
@@ -114,19 +118,20 @@ fig = plot_project_gantt_with_start_end(
 OUTPUT_SVG_FILE = '../gantt_chart_processed.svg'  # Adjust path
 if fig:
     try:
-        logging.info(f'Saving plot to {OUTPUT_SVG_FILE}...')
-        fig.savefig(OUTPUT_SVG_FILE, format='svg', bbox_inches='tight')
-        logging.info('Plot saved successfully.')
+        logger.info('Saving plot to %s...', OUTPUT_SVG_FILE)
+        save_svg(fig, OUTPUT_SVG_FILE, bbox_inches='tight')
+        logger.info('Plot saved successfully.')
     except Exception as e:
-        logging.info(f'Error saving plot to SVG: {e}')
+        logger.info('Error saving plot to SVG: %s', e)
 else:
-    logging.info('Plot figure was not generated, skipping save.')
+    logger.info('Plot figure was not generated, skipping save.')
 
-# --- 5. Optionally Show the Plot ---
-if fig:
-    logging.info('Displaying plot...')
-    plt.show()
-else:
-    logging.info('Plot figure was not generated, skipping display.')
+# --- 5. Optionally Show the Plot (run with --show) ---
+# A low resolution PNG is displayed; the SVG file keeps full detail.
+if fig and '--show' in sys.argv[1:]:
+    logger.info('Displaying plot...')
+    show_png(fig)
+elif not fig:
+    logger.info('Plot figure was not generated, skipping display.')
 
-logging.info('Example script finished.')
+logger.info('Example script finished.')
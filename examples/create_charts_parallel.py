@@ -0,0 +1,63 @@
+# examples/create_charts_parallel.py
+"""Renders Gantt charts for several project JSON files in parallel processes.
+
+Usage: python examples/create_charts_parallel.py [project.json ...]
+
+Each chart is written next to its JSON file with an .svg extension.
+"""
+
+import logging
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use('Agg')  # Non-interactive backend; must be set before pyplot is imported
+
+from pyganttccpm import plot_project_gantt, save_svg  # noqa: E402
+from pyganttccpm.loader import load_process_project_data  # noqa: E402
+
+# --- Basic Logging Configuration for the Application ---
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(processName)s - %(name)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+# --- End Logging Configuration ---
+
+DEFAULT_JSON_FILES = ['./examples/project-gantt-data.json']
+
+
+def render_one(json_path, svg_path):
+    """Loads one project file and saves its chart. Returns the SVG path or None."""
+    import matplotlib.pyplot as plt
+
+    project_data = load_process_project_data(json_path)
+    project_start_date, tasks = project_data[0], project_data[1]
+    if tasks is None or project_start_date is None:
+        logger.error('Failed to load or process project data from %s.', json_path)
+        return None
+
+    fig = plot_project_gantt(*project_data)
+    save_svg(fig, svg_path, bbox_inches='tight')
+    plt.close(fig)  # Worker processes are reused, so free the figure
+    logger.info('Saved %s', svg_path)
+    return svg_path
+
+
+if __name__ == '__main__':
+    json_files = [Path(p) for p in (sys.argv[1:] or DEFAULT_JSON_FILES)]
+    svg_files = [p.with_suffix('.svg') for p in json_files]
+
+    # Charts are independent, so they render on separate cores
+    with ProcessPoolExecutor() as executor:
+        results = list(executor.map(render_one, json_files, svg_files))
+
+    failed = [
+        str(p) for p, result in zip(json_files, results, strict=True) if result is None
+    ]
+    if failed:
+        logger.error('Could not render: %s', ', '.join(failed))
+        sys.exit(1)
+    logger.info('Rendered %d charts.', len(results))
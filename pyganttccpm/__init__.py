@@ -1,6 +1,6 @@
 # pyganttccpm/__init__.py
+import importlib
 import logging
-import tkinter
 from os import environ
 from pathlib import Path
 from sys import base_prefix
@@ -17,21 +17,66 @@ log = logging.getLogger(__name__)
 log.addHandler(logging.NullHandler())
 # --- End Logging Setup ---
 
-from .plotter import plot_project_gantt
-from .loader import process_project_data  # <-- Add this
-from .config import TaskType
+from .config import TaskType  # Lightweight, no matplotlib import
 
-# Required for matplotlib to work with tkinter on some systems
-# https://github.com/astral-sh/uv/issues/7036
-if not ('TCL_LIBRARY' in environ and 'TK_LIBRARY' in environ):
+# Public names that pull in matplotlib/networkx, imported on first access
+# (PEP 562) so 'import pyganttccpm' stays cheap: name -> (module, attribute)
+_LAZY_ATTRIBUTES = {
+    'plot_project_gantt': ('.plotter', 'plot_project_gantt'),
+    # Former name of plot_project_gantt, kept for existing callers
+    'plot_project_gantt_with_start_end': ('.plotter', 'plot_project_gantt'),
+    'process_project_data': ('.loader', 'process_project_data'),
+    'load_process_project_data': ('.loader', 'load_process_project_data'),
+    'save_svg': ('.export', 'save_svg'),
+    'show_png': ('.export', 'show_png'),
+}
+
+
+def configure_tk():
+    """
+    Points TCL_LIBRARY/TK_LIBRARY at the interpreter's Tcl/Tk if Tk cannot start.
+
+    Required for matplotlib to work with tkinter on some systems
+    https://github.com/astral-sh/uv/issues/7036
+    plot_project_gantt calls it before creating its first figure when the
+    matplotlib backend is Tk based (e.g. TkAgg); other backends never start
+    Tk. Call it yourself before importing matplotlib.pyplot if matplotlib
+    falls back to a non-interactive backend because Tk fails to start.
+    Does nothing if the variables are already set or tkinter is not available.
+    """
+    if 'TCL_LIBRARY' in environ and 'TK_LIBRARY' in environ:
+        return
+    try:
+        import tkinter
+    except ImportError:
+        return
     try:
         root = tkinter.Tk()
         root.destroy()
     except tkinter.TclError:
         tk_dir = 'tcl' if platform.system() == 'Windows' else 'lib'
         tk_path = Path(base_prefix) / tk_dir
-        environ['TCL_LIBRARY'] = str(next(tk_path.glob('tcl8.*')))
-        environ['TK_LIBRARY'] = str(next(tk_path.glob('tk8.*')))
+        tcl_library = next(tk_path.glob('tcl8.*'), None)
+        tk_library = next(tk_path.glob('tk8.*'), None)
+        if tcl_library is None or tk_library is None:
+            # E.g. no display: Tk is installed but cannot open a window
+            log.debug('Tk could not start and no Tcl/Tk libraries found in %s', tk_path)
+            return
+        environ['TCL_LIBRARY'] = str(tcl_library)
+        environ['TK_LIBRARY'] = str(tk_library)
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module_name, attribute = _LAZY_ATTRIBUTES[name]
+    value = getattr(importlib.import_module(module_name, __name__), attribute)
+    globals()[name] = value  # Cache, later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 
 __version__ = '0.1.0'
@@ -39,10 +84,14 @@ __author__ = 'R.N. Wolf'
 
 # Optional: Define __all__ to control 'from pyganttccpm import *'
 __all__ = [
+    'plot_project_gantt',
     'plot_project_gantt_with_start_end',
     'process_project_data',
     'load_process_project_data',
     'TaskType',
+    'save_svg',
+    'show_png',
+    'configure_tk',
     'log',
     '__version__',
     '__author__',
@@ -14,6 +14,10 @@ class TaskType(Enum):
     SYSTEM = auto()
 
 
+# Plain dict lookup for resolving type names from input data
+TASK_TYPE_BY_NAME = {task_type.name: task_type for task_type in TaskType}
+
+
 TASK_COLORS = {
     TaskType.UNASSIGNED: "purple",
     TaskType.CRITICAL: "red",
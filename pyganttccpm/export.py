@@ -0,0 +1,101 @@
+# pyganttccpm/export.py
+import gzip
+import io
+import logging
+import os
+import re
+
+import matplotlib as mpl
+
+log = logging.getLogger('pyganttccpm')  # <-- Get the library logger
+
+# rcParams applied while writing SVG files. Simplification drops path
+# vertices closer than a pixel, 'none' writes text as <text> elements instead
+# of embedded glyph outlines and a fixed salt keeps generated ids stable.
+SVG_SAVE_RCPARAMS = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'svg.fonttype': 'none',
+    'svg.hashsalt': 'pyganttccpm',
+}
+
+# Attributes holding coordinates; metadata (e.g. dc:date) is left untouched
+_GEOMETRY_ATTR_RE = re.compile(rb'(\s(?:d|x|y|width|height|transform)=")([^"]*)(")')
+_FLOAT_RE = re.compile(rb'-?\d+\.\d+')
+_WHITESPACE_RE = re.compile(rb'\s+')
+# Indentation and line breaks between elements; text content is not touched
+_INTER_TAG_WHITESPACE_RE = re.compile(rb'>\s+<')
+
+
+def _round_floats(values, precision):
+    """Rounds every decimal number in an attribute value to `precision` digits."""
+
+    def round_match(match):
+        rounded = f'{float(match.group(0)):.{precision}f}'
+        if '.' in rounded:  # With precision=0 the zeros of '100' are significant
+            rounded = rounded.rstrip('0').rstrip('.')
+        return b'0' if rounded == '-0' else rounded.encode()
+
+    return _FLOAT_RE.sub(round_match, values)
+
+
+def save_svg(fig, file_path, precision=2, minify=True, **savefig_kwargs):
+    """
+    Saves a figure as a compact SVG file.
+
+    Args:
+        fig (matplotlib.figure.Figure): The figure to save, e.g. from plot_project_gantt.
+        file_path (str or Path): Destination of the SVG file. A '.svgz' suffix
+                                 writes the file gzip-compressed.
+        precision (int, optional): Number of decimals kept for coordinates (>= 0).
+                                   None keeps matplotlib's full precision. Defaults to 2.
+        minify (bool, optional): If True (default), strip line breaks inside path data
+                                 and indentation between elements.
+        **savefig_kwargs: Passed on to `Figure.savefig` (e.g. bbox_inches='tight').
+    """
+    if precision is not None and precision < 0:
+        raise ValueError(f'precision must be None or >= 0, not {precision!r}')
+    buffer = io.BytesIO()
+    with mpl.rc_context(SVG_SAVE_RCPARAMS):
+        fig.savefig(buffer, format='svg', **savefig_kwargs)
+    svg_bytes = buffer.getvalue()
+
+    if precision is not None or minify:
+
+        def compact_geometry(match):
+            values = match.group(2)
+            if precision is not None:
+                values = _round_floats(values, precision)
+            if minify:
+                values = _WHITESPACE_RE.sub(b' ', values).strip()
+            return match.group(1) + values + match.group(3)
+
+        svg_bytes = _GEOMETRY_ATTR_RE.sub(compact_geometry, svg_bytes)
+    if minify:
+        svg_bytes = _INTER_TAG_WHITESPACE_RE.sub(b'><', svg_bytes)
+    if os.fspath(file_path).lower().endswith('.svgz'):
+        # mtime=0 keeps the output identical for identical charts
+        svg_bytes = gzip.compress(svg_bytes, mtime=0)
+
+    with open(file_path, 'wb') as f:
+        f.write(svg_bytes)
+    log.debug('Saved %d bytes of SVG to %s', len(svg_bytes), file_path)
+
+
+def show_png(fig, dpi=72):
+    """
+    Displays a figure as a low resolution PNG in the system image viewer.
+
+    Rendering a single raster image is much cheaper than redrawing every
+    artist of a large chart in an interactive window.
+
+    Args:
+        fig (matplotlib.figure.Figure): The figure to display.
+        dpi (int, optional): Resolution of the rendered image. Defaults to 72.
+    """
+    from PIL import Image  # Pillow is a matplotlib dependency
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi)
+    buffer.seek(0)
+    Image.open(buffer).show()
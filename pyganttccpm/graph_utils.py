@@ -7,6 +7,60 @@ import logging
 log = logging.getLogger('pyganttccpm')  # <-- Get the library logger
 
 
+def task_date_bounds(tasks, exclude=()):
+    """
+    Finds the earliest/latest start and end dates of the tasks in a single pass.
+
+    Args:
+        tasks (dict): Dictionary of task data.
+        exclude (iterable): Task names to ignore, e.g. START/END nodes.
+    Returns:
+        tuple: (min_start, max_start, min_end, max_end); an entry is None if no
+               task has a datetime for that field.
+    """
+    min_start = max_start = min_end = max_end = None
+    for name, data in tasks.items():
+        if name in exclude:
+            continue
+        start = data.get('start')
+        if isinstance(start, datetime):
+            if min_start is None or start < min_start:
+                min_start = start
+            if max_start is None or start > max_start:
+                max_start = start
+        end = data.get('end')
+        if isinstance(end, datetime):
+            if min_end is None or end < min_end:
+                min_end = end
+            if max_end is None or end > max_end:
+                max_end = end
+    return min_start, max_start, min_end, max_end
+
+
+def topological_layers(G):
+    """
+    Assigns every node of a DAG its dependency layer.
+
+    Nodes without predecessors are in layer 0; every other node is one layer
+    below its deepest predecessor (Kahn's algorithm, O(V+E)).
+
+    Args:
+        G (networkx.DiGraph): The dependency graph.
+    Returns:
+        dict: Mapping of node to layer index.
+    Raises:
+        ValueError: If the graph contains a cycle.
+    """
+    try:
+        return {
+            node: layer
+            for layer, generation in enumerate(nx.topological_generations(G))
+            for node in generation
+        }
+    except nx.NetworkXUnfeasible as e:
+        raise ValueError('Dependencies contain a cycle; cannot assign layers.') from e
+
+
 # --- Function to add Global START/END Nodes ---
 def add_global_start_end(G, tasks, stream_map):
     """Adds global START and END nodes, assigning type and chain. Modifies tasks and stream_map in place."""
@@ -20,37 +74,27 @@ def add_global_start_end(G, tasks, stream_map):
 
     if start_node_name in G or end_node_name in G:
         log.info('Info: START/END nodes already exist.')
-        return  # Already added
+        return G, tasks, stream_map  # Already added
 
     if not G.nodes:
         log.warning('Warning: Graph is empty, cannot add START/END nodes.')
-        return  # Empty graph
-
-    root_nodes = [
-        node
-        for node, degree in G.in_degree()
-        if degree == 0 and node not in [start_node_name, end_node_name]
-    ]
-    leaf_nodes = [
-        node
-        for node, degree in G.out_degree()
-        if degree == 0 and node not in [start_node_name, end_node_name]
-    ]
-
-    all_starts = [
-        data['start']
-        for name, data in tasks.items()
-        if isinstance(data.get('start'), datetime)
-        and name not in [start_node_name, end_node_name]
-    ]
-    all_ends = [
-        data['end']
-        for name, data in tasks.items()
-        if isinstance(data.get('end'), datetime)
-        and name not in [start_node_name, end_node_name]
-    ]
-
-    if not all_starts or not all_ends:
+        return G, tasks, stream_map  # Empty graph
+
+    # Roots have no predecessors and leaves no successors; find both in one pass.
+    # START/END cannot be in G here (see the early return above).
+    root_nodes = []
+    leaf_nodes = []
+    for node in G:
+        if not G.pred[node]:
+            root_nodes.append(node)
+        if not G.succ[node]:
+            leaf_nodes.append(node)
+
+    min_start_date, _, _, max_end_date = task_date_bounds(
+        tasks, exclude=(start_node_name, end_node_name)
+    )
+
+    if min_start_date is None or max_end_date is None:
         # If only START/END nodes exist or no valid dates, create a default range
         if tasks:
             base_date = next(iter(tasks.values())).get('start', datetime.now())
@@ -61,9 +105,6 @@ def add_global_start_end(G, tasks, stream_map):
         log.warning(
             'Warning: Could not determine date range from tasks. Using default range.'
         )
-    else:
-        min_start_date = min(all_starts)
-        max_end_date = max(all_ends)
 
     # Define START/END Task Data
     start_node_date = min_start_date - timedelta(days=1)
@@ -96,11 +137,9 @@ def add_global_start_end(G, tasks, stream_map):
     tasks[end_node_name] = end_task_data
     stream_map[end_node_name] = end_task_data['chain']
 
-    log.debug(f'Connecting START to roots: {root_nodes}')
-    for root in root_nodes:
-        G.add_edge(start_node_name, root)
-    log.debug(f'Connecting leaves to END: {leaf_nodes}')
-    for leaf in leaf_nodes:
-        G.add_edge(leaf, end_node_name)
+    log.debug('Connecting START to roots: %s', root_nodes)
+    G.add_edges_from([(start_node_name, root) for root in root_nodes])
+    log.debug('Connecting leaves to END: %s', leaf_nodes)
+    G.add_edges_from([(leaf, end_node_name) for leaf in leaf_nodes])
 
     return G, tasks, stream_map
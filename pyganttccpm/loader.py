@@ -1,13 +1,137 @@
 # pyganttccpm/loader.py
 import json
+from collections.abc import MutableMapping
+from dataclasses import dataclass, fields, replace
 from datetime import datetime, timedelta
 import sys
-from .config import TaskType
+from .config import TASK_TYPE_BY_NAME, TaskType
 import logging
 import math  # Import math for infinity
+import re
+import numpy as np
+from dateutil import parser as dateutil_parser
+
+try:
+    import orjson  # Optional: faster JSON parsing for large project files
+except ImportError:
+    orjson = None
+
+try:
+    # Optional: C parser for ISO-8601 timestamps, faster than fromisoformat
+    from ciso8601 import parse_datetime as _parse_iso_datetime
+except ImportError:
+    _parse_iso_datetime = datetime.fromisoformat
 
 log = logging.getLogger('pyganttccpm')  # <-- Get the library logger
 
+MICROSECONDS_PER_DAY = 24 * 3600 * 1_000_000
+
+# Largest day offset that can still be a date: the span of datetime. This
+# also keeps offsets and their differences well inside int64 microseconds.
+_MAX_OFFSET_DAYS = (datetime.max - datetime.min).days
+
+# Predecessors are a comma separated list of integer task IDs, e.g. "1, 2";
+# empty entries are ignored. IDs follow int()'s grammar, including
+# underscores between digits ("1_000")
+_PREDECESSOR_ID = r'[+-]?\d+(?:_\d+)*'
+_PREDECESSOR_ID_RE = re.compile(_PREDECESSOR_ID)
+_PREDECESSOR_LIST_RE = re.compile(
+    rf'\s*(?:{_PREDECESSOR_ID}\s*)?(?:,\s*(?:{_PREDECESSOR_ID}\s*)?)*'
+)
+
+
+@dataclass(slots=True, eq=False)
+class TaskRecord(MutableMapping):
+    """
+    A processed task, as stored in the `tasks` dict returned by process_project_data.
+
+    Fields are slots rather than dict entries, which keeps large task lists
+    compact. Records can still be used like the task dicts accepted by the
+    plotter (record['start'], record.get('url'), record['url'] = ...,
+    record.copy()) and compare equal to a dict with the same items. Unlike a
+    dict, only the fields below can be set and none can be deleted.
+    """
+
+    id: object
+    start: datetime
+    end: datetime
+    total_duration: timedelta
+    completed_duration: timedelta
+    remaining_duration: timedelta
+    has_remaining_data: bool
+    type: TaskType
+    chain: str
+    resources: str
+    predecessors_str: str
+    url: object
+    tags: list
+
+    def __getitem__(self, key):
+        if key not in _TASK_RECORD_FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in _TASK_RECORD_FIELD_SET:
+            raise KeyError(f'{key!r} is not a TaskRecord field')
+        setattr(self, key, value)
+
+    def __delitem__(self, key):
+        raise TypeError('TaskRecord fields cannot be deleted')
+
+    def __iter__(self):
+        return iter(_TASK_RECORD_FIELDS)
+
+    def __len__(self):
+        return len(_TASK_RECORD_FIELDS)
+
+    def get(self, key, default=None):
+        # Faster than Mapping.get, which goes through __getitem__ and KeyError
+        if key in _TASK_RECORD_FIELD_SET:
+            return getattr(self, key)
+        return default
+
+    def copy(self):
+        """Returns a shallow copy, like dict.copy()."""
+        return replace(self)
+
+
+_TASK_RECORD_FIELDS = tuple(field.name for field in fields(TaskRecord))
+_TASK_RECORD_FIELD_SET = frozenset(_TASK_RECORD_FIELDS)
+
+
+def _days_to_microseconds(day_offsets):
+    """Converts a sequence of (fractional) day offsets to whole microseconds."""
+    return np.rint(
+        np.asarray(day_offsets, dtype=np.float64) * MICROSECONDS_PER_DAY
+    ).astype(np.int64)
+
+
+def _float_or_nan(value):
+    """Converts a JSON value to float; missing or invalid values become NaN."""
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return math.nan
+
+
+def _loads_json(raw_data):
+    """Parses JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(raw_data)
+        except orjson.JSONDecodeError:
+            pass  # e.g. NaN/Infinity literals, which only json accepts
+    return json.loads(raw_data)
+
+
+def _parse_datetime(date_str):
+    """Parses an ISO-8601 date string, using dateutil only for other formats."""
+    try:
+        return _parse_iso_datetime(date_str)
+    except ValueError:
+        return dateutil_parser.parse(date_str)
+
 
 # --- New Processing Function ---
 def process_project_data(project_info_dict, tasks_list):
@@ -25,23 +149,20 @@ def process_project_data(project_info_dict, tasks_list):
         calendar_type = raw_calendar_type
     else:
         log.warning(
-            f"Warning: Invalid calendar type '{project_info_dict.get('calendar', '')}'. Defaulting to 'standard'."
+            "Warning: Invalid calendar type '%s'. Defaulting to 'standard'.",
+            project_info_dict.get('calendar', ''),
         )
         calendar_type = 'standard'
 
     raw_publish_date_str = project_info_dict.get('publish_date')
     if raw_publish_date_str:
         try:
-            # Use dateutil if available, otherwise isoformat
-            try:
-                from dateutil import parser
-
-                project_publish_date = parser.parse(raw_publish_date_str)
-            except ImportError:
-                project_publish_date = datetime.fromisoformat(raw_publish_date_str)
+            project_publish_date = _parse_datetime(raw_publish_date_str)
         except (ValueError, TypeError) as e:
             log.warning(
-                f"Warning: Could not parse project publish date '{raw_publish_date_str}'. {e}"
+                "Warning: Could not parse project publish date '%s'. %s",
+                raw_publish_date_str,
+                e,
             )
             project_publish_date = None
 
@@ -50,12 +171,7 @@ def process_project_data(project_info_dict, tasks_list):
     start_date_valid = False
     if raw_start_date_str:
         try:
-            try:
-                from dateutil import parser
-
-                parsed_start_date = parser.parse(raw_start_date_str)
-            except ImportError:
-                parsed_start_date = datetime.fromisoformat(raw_start_date_str)
+            parsed_start_date = _parse_datetime(raw_start_date_str)
             # Normalize valid start date
             project_start_date = parsed_start_date.replace(
                 hour=0, minute=0, second=0, microsecond=0
@@ -63,7 +179,9 @@ def process_project_data(project_info_dict, tasks_list):
             start_date_valid = True
         except (ValueError, TypeError, AttributeError) as e:
             log.warning(
-                f"Invalid project start date '{raw_start_date_str}': {e}. Synthesizing start date."
+                "Invalid project start date '%s': %s. Synthesizing start date.",
+                raw_start_date_str,
+                e,
             )
             # Proceed to synthesize below
 
@@ -75,17 +193,16 @@ def process_project_data(project_info_dict, tasks_list):
         calendar_type = 'continuous'  # Force continuous calendar
 
         # Find minimum start offset from tasks
-        min_offset = math.inf
-        has_tasks = False
-        for task_item in tasks_list:
-            try:
-                offset = float(task_item.get('start', 0))
-                min_offset = min(min_offset, offset)
-                has_tasks = True
-            except (ValueError, TypeError):
-                continue  # Ignore tasks with invalid start offsets for this calculation
-
-        if not has_tasks or min_offset == math.inf:
+        # Tasks with invalid start offsets (NaN) are ignored for this calculation
+        offsets = np.fromiter(
+            (_float_or_nan(task_item.get('start', 0)) for task_item in tasks_list),
+            dtype=np.float64,
+            count=len(tasks_list),
+        )
+        offsets = offsets[~np.isnan(offsets)]
+        min_offset = float(offsets.min()) if offsets.size else math.inf
+
+        if min_offset == math.inf:
             log.warning(
                 'No valid task start offsets found. Using today as Day 0 for synthetic start date.'
             )
@@ -98,101 +215,139 @@ def process_project_data(project_info_dict, tasks_list):
         )
         project_start_date = today_midnight - timedelta(days=min_offset)
         log.info(
-            f'Synthetic Project Start Date (for Day 0 = offset {min_offset}): {project_start_date.isoformat()}'
+            'Synthetic Project Start Date (for Day 0 = offset %s): %s',
+            min_offset,
+            project_start_date.isoformat(),
         )
 
     # --- End Process Start Date ---
 
     # --- Process Tasks (similar logic as load_process_project_data) ---
     tasks = {}
-    stream_map = {}
     id_to_name = {}
 
-    # First pass...
+    # First pass: validate tasks and collect their day offsets
+    valid_items = []
+    start_offsets = []
+    finish_offsets = []
+    remaining_offsets = []  # NaN marks missing or invalid 'remaining' data
     for task_item in tasks_list:  # Iterate over the input list
-        task_id = task_item.get('id')
-        task_name = task_item.get('name')
+        get = task_item.get  # Bound once; called for every field below
+        task_id = get('id')
+        task_name = get('name')
         if task_id is None or task_name is None:
             continue
         id_to_name[task_id] = task_name
         try:
-            start_offset = float(task_item.get('start', 0))
-            finish_offset = float(task_item.get('finish', start_offset))
-            start_datetime = project_start_date + timedelta(days=start_offset)
-            end_datetime = project_start_date + timedelta(days=finish_offset)
-            if end_datetime <= start_datetime:
-                end_datetime = start_datetime
-            total_duration_td = end_datetime - start_datetime
-            remaining_offset = task_item.get('remaining')
-            remaining_duration_td = timedelta(0)
-            has_remaining_data = False
-            if remaining_offset is not None:
-                has_remaining_data = True
-                try:
-                    remaining_offset_float = float(remaining_offset)
-                    if remaining_offset_float < 0:
-                        remaining_offset_float = 0
-                    remaining_duration_td = timedelta(days=remaining_offset_float)
-                    if remaining_duration_td > total_duration_td:
-                        remaining_duration_td = total_duration_td
-                except (ValueError, TypeError):
-                    remaining_duration_td = timedelta(0)
-                    has_remaining_data = False
-            completed_duration_td = total_duration_td - remaining_duration_td
-            type_str = task_item.get('type', 'UNASSIGNED').upper()
-            try:
-                task_type = TaskType[type_str]
-            except KeyError:
-                task_type = TaskType.UNASSIGNED
-            task_url = task_item.get('url', None)
-            task_tags = task_item.get('tags', [])
-            if not isinstance(task_tags, list):
-                task_tags = []
-
-            tasks[task_name] = {
-                'id': task_id,
-                'start': start_datetime,
-                'end': end_datetime,
-                'total_duration': total_duration_td,
-                'completed_duration': completed_duration_td,
-                'remaining_duration': remaining_duration_td,
-                'has_remaining_data': has_remaining_data,
-                'type': task_type,
-                'chain': task_item.get('chain', 'Unknown'),
-                'resources': task_item.get('resources', ''),
-                'predecessors_str': task_item.get('predecessors', ''),
-                'url': task_url,
-                'tags': task_tags,
-            }
-            stream_map[task_name] = tasks[task_name]['chain']
+            start_offset = float(get('start', 0))
+            finish_offset = float(get('finish', start_offset))
+            if not (math.isfinite(start_offset) and math.isfinite(finish_offset)):
+                raise ValueError('start/finish offsets must be finite numbers')
+            if max(abs(start_offset), abs(finish_offset)) > _MAX_OFFSET_DAYS:
+                raise ValueError(
+                    f'start/finish offsets must be within {_MAX_OFFSET_DAYS} days'
+                )
         except (ValueError, TypeError) as e:
             log.warning(
-                f"Warning: Skipping task '{task_name}' (ID: {task_id}) due to invalid data: {e}"
+                "Warning: Skipping task '%s' (ID: %s) due to invalid data: %s",
+                task_name,
+                task_id,
+                e,
+            )
+            continue
+        remaining_offset = _float_or_nan(get('remaining'))
+        valid_items.append((task_id, task_name, task_item))
+        start_offsets.append(start_offset)
+        finish_offsets.append(finish_offset)
+        remaining_offsets.append(remaining_offset)
+
+    # Convert all day offsets to durations in one vectorized step
+    start_us = _days_to_microseconds(start_offsets)
+    finish_us = np.maximum(_days_to_microseconds(finish_offsets), start_us)
+    total_us = finish_us - start_us
+    remaining_days = np.asarray(remaining_offsets, dtype=np.float64)
+    has_remaining = ~np.isnan(remaining_days)
+    # Bound 'remaining' in days first so that huge values cannot overflow int64
+    remaining_days = np.clip(np.nan_to_num(remaining_days), 0, _MAX_OFFSET_DAYS)
+    remaining_us = np.where(
+        has_remaining,
+        np.minimum(_days_to_microseconds(remaining_days), total_us),
+        0,
+    )
+    start_tds = start_us.astype('timedelta64[us]').tolist()
+    total_tds = total_us.astype('timedelta64[us]').tolist()
+    remaining_tds = remaining_us.astype('timedelta64[us]').tolist()
+    completed_tds = (total_us - remaining_us).astype('timedelta64[us]').tolist()
+
+    # Assemble the task records from the precomputed durations
+    for i, (task_id, task_name, task_item) in enumerate(valid_items):
+        get = task_item.get
+        try:
+            start_datetime = project_start_date + start_tds[i]
+            end_datetime = start_datetime + total_tds[i]
+        except OverflowError as e:
+            log.warning(
+                "Warning: Skipping task '%s' (ID: %s) due to invalid data: %s",
+                task_name,
+                task_id,
+                e,
             )
             continue
+        type_str = get('type', 'UNASSIGNED')
+        task_type = TASK_TYPE_BY_NAME.get(type_str)
+        if task_type is None:  # Only non-uppercase or unknown names need .upper()
+            task_type = TASK_TYPE_BY_NAME.get(type_str.upper(), TaskType.UNASSIGNED)
+        task_url = get('url', None)
+        task_tags = get('tags', [])
+        if not isinstance(task_tags, list):
+            task_tags = []
+
+        tasks[task_name] = TaskRecord(
+            id=task_id,
+            start=start_datetime,
+            end=end_datetime,
+            total_duration=total_tds[i],
+            completed_duration=completed_tds[i],
+            remaining_duration=remaining_tds[i],
+            has_remaining_data=bool(has_remaining[i]),
+            type=task_type,
+            chain=get('chain', 'Unknown'),
+            resources=get('resources', ''),
+            predecessors_str=get('predecessors', ''),
+            url=task_url,
+            tags=task_tags,
+        )
+
+    # Chains of the tasks that were kept, used for the swimlane layout
+    stream_map = {task_name: task.chain for task_name, task in tasks.items()}
 
     # Second pass: resolve dependencies
     dependencies = []
     for task_name, task_data in tasks.items():
         pred_str = task_data.get('predecessors_str', '')
         if pred_str:
-            try:
-                # Assuming predecessors are given as string of IDs, convert to names
-                pred_ids = [
-                    int(p_id.strip()) for p_id in pred_str.split(',') if p_id.strip()
-                ]
-                for p_id in pred_ids:
-                    pred_name = id_to_name.get(p_id)
-                    if pred_name:
-                        dependencies.append((pred_name, task_name))
-                    else:
-                        log.warning(
-                            f"Warning: Predecessor ID '{p_id}' not found for task '{task_name}'."
-                        )
-            except ValueError:
+            # Assuming predecessors are given as string of IDs, convert to names
+            pred_str = str(pred_str)
+            if not _PREDECESSOR_LIST_RE.fullmatch(pred_str):
                 log.warning(
-                    f"Warning: Invalid predecessor format '{pred_str}' for task '{task_name}'."
+                    "Warning: Invalid predecessor format '%s' for task '%s'.",
+                    pred_str,
+                    task_name,
                 )
+                continue
+            pred_ids = list(map(int, _PREDECESSOR_ID_RE.findall(pred_str)))
+            pred_names = [id_to_name.get(p_id) for p_id in pred_ids]
+            dependencies.extend(
+                (pred_name, task_name) for pred_name in pred_names if pred_name
+            )
+            if not all(pred_names):
+                for p_id, pred_name in zip(pred_ids, pred_names, strict=True):
+                    if not pred_name:
+                        log.warning(
+                            "Warning: Predecessor ID '%s' not found for task '%s'.",
+                            p_id,
+                            task_name,
+                        )
     # --- End Process Tasks ---
 
     return (
@@ -213,15 +368,17 @@ def load_process_project_data(file_path):
     project_info_dict = {}
     tasks_list = []
     try:
-        with open(file_path, 'r') as f:
-            data = json.load(f)
+        # Read raw bytes; orjson parses them directly without a decode step
+        with open(file_path, 'rb') as f:
+            raw_data = f.read()
+        data = _loads_json(raw_data)
         project_info_dict = data.get('project_info', {})
         tasks_list = data.get('tasks', [])
     except FileNotFoundError:
-        log.error(f'Error: JSON file not found at {file_path}')
+        log.error('Error: JSON file not found at %s', file_path)
         return None, None, None, None, None, None, None, None
-    except json.JSONDecodeError:
-        log.error(f'Error: Could not decode JSON from {file_path}')
+    except json.JSONDecodeError:  # orjson.JSONDecodeError is a subclass
+        log.error('Error: Could not decode JSON from %s', file_path)
         return None, None, None, None, None, None, None, None
 
     # Delegate processing to the new function
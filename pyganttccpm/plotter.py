@@ -1,24 +1,94 @@
 # pyganttccpm/plotter.py
 import matplotlib as mpl
 import matplotlib.pyplot as plt
+import matplotlib.colors as mcolors
 import matplotlib.dates as mdates
 import matplotlib.patches as mpatches
 import matplotlib.ticker as mticker
+from matplotlib.collections import PolyCollection
+from matplotlib.font_manager import FontProperties
 import networkx as nx
-from datetime import datetime, timedelta
+import numpy as np
+from datetime import datetime, time, timedelta
 import logging
+from operator import attrgetter
 
 # Import from other modules within the package
 # Re-add START_NODE, END_NODE and add_global_start_end
 from .config import TASK_COLORS, TaskType, START_NODE, END_NODE
-from .graph_utils import add_global_start_end  # Re-add this import
+from .graph_utils import add_global_start_end, task_date_bounds, topological_layers
+from .loader import TaskRecord
+from . import configure_tk
 
 log = logging.getLogger('pyganttccpm')
 
+# Box drawn behind tag labels; Text.set_bbox copies it, so one dict is shared
+_TAG_BBOX = dict(facecolor='black', alpha=0.4, pad=1, boxstyle='round,pad=0.1')
+
+# Task fields read by the plotter, in the order of the tuples from _task_row
+_TASK_FIELDS = (
+    'start',
+    'end',
+    'id',
+    'total_duration',
+    'completed_duration',
+    'has_remaining_data',
+    'type',
+    'url',
+    'tags',
+    'resources',
+)
+# Defaults for fields missing from plain task dicts (TaskRecords have them all).
+# A missing 'total_duration' stays None: bars treat it as zero, arrows as not
+_TASK_FIELD_DEFAULTS = {
+    'id': '?',
+    'completed_duration': timedelta(0),
+    'has_remaining_data': False,
+    'tags': [],
+    'resources': '',
+}
+_TASK_RECORD_GETTER = attrgetter(*_TASK_FIELDS)
+
+# Set by _configure_tk_backend; headless backends (e.g. Agg) never probe Tk
+_tk_configured = False
+
 # Set UTC timezone preference within the module or rely on user setting it
 # mpl.rcParams["timezone"] = "UTC" # Consider if this should be enforced or documented
 
 
+def _configure_tk_backend():
+    """Runs configure_tk once, before a Tk based backend creates its first window."""
+    global _tk_configured
+    if not _tk_configured and mpl.get_backend().lower().startswith('tk'):
+        configure_tk()
+        _tk_configured = True
+
+
+def _task_row(data):
+    """Returns the _TASK_FIELDS values of one task record or task dict."""
+    if isinstance(data, TaskRecord):
+        return _TASK_RECORD_GETTER(data)  # Plain attribute reads
+    get = data.get
+    return tuple(get(field, _TASK_FIELD_DEFAULTS.get(field)) for field in _TASK_FIELDS)
+
+
+def _bar_vertices(left, width, y_center, height):
+    """Returns an (N, 4, 2) array of rectangle corners for horizontal bars."""
+    left, width, y_center = np.broadcast_arrays(left, width, y_center)
+    right = left + width
+    bottom = y_center - height / 2
+    top = y_center + height / 2
+    return np.stack(
+        [
+            np.column_stack([left, bottom]),
+            np.column_stack([right, bottom]),
+            np.column_stack([right, top]),
+            np.column_stack([left, top]),
+        ],
+        axis=1,
+    )
+
+
 # --- Unified Plotting Function with Optional START/END ---
 def plot_project_gantt(
     project_start_date,
@@ -30,6 +100,9 @@ def plot_project_gantt(
     project_publish_date=None,
     is_synthetic_start_date=False,
     add_start_end_nodes=True,  # <-- New parameter
+    min_label_px=None,
+    rasterize_bars_above=None,
+    lane_layout='chain',
 ):
     """
     Generates the Gantt chart plot.
@@ -51,46 +124,63 @@ def plot_project_gantt(
         add_start_end_nodes (bool): If True (default), add global START and END nodes
                                     to wrap the entire network graph. If False, plot the
                                     graph as provided.
+        min_label_px (float, optional): If set, task bars narrower than this many pixels
+                                        are drawn without name and tag labels, which would
+                                        only overflow the bar on dense charts. Widths are
+                                        measured at the figure dpi on the final layout.
+                                        Defaults to None (label every bar).
+        rasterize_bars_above (int, optional): If set and more than this many task bars
+                                              are drawn, the bars are embedded as one
+                                              raster image in vector output (SVG/PDF),
+                                              at the savefig dpi. This keeps files with
+                                              thousands of tasks small and fast to
+                                              display, but rasterized bars carry no
+                                              URLs; labels stay vector text. Defaults
+                                              to None (always draw vector bars).
+        lane_layout (str, optional): 'chain' (default) draws each chain from
+                                     `stream_map` in its own lane. 'topological'
+                                     instead puts every task in the lane of its
+                                     dependency layer (roots in layer 0, each task
+                                     one layer below its deepest predecessor).
     Returns:
         matplotlib.figure.Figure: The generated Matplotlib figure object.
     """
+    if lane_layout not in ('chain', 'topological'):
+        raise ValueError(
+            f"lane_layout must be 'chain' or 'topological', not {lane_layout!r}"
+        )
     if add_start_end_nodes:
         log.info('Generating Gantt plot with automatic START/END nodes...')
     else:
         log.info('Generating Gantt plot without automatic START/END nodes...')
+    _configure_tk_backend()
 
-    # 1 - Make copies to avoid modifying original data ---
-    # Especially important if add_global_start_end modifies them in place
-    tasks_copy = tasks.copy()
-    dependencies_copy = list(dependencies)  # Create a shallow copy of the list
-    stream_map_copy = stream_map.copy()
-    # --- End copies ---
+    # 1 - The input mappings are only read; the copies that
+    # add_global_start_end fills in are made below, only if it runs
+    tasks_copy = tasks
+    stream_map_copy = stream_map
 
     # 2. Build Graph from potentially modified tasks and dependencies
     G = nx.DiGraph()
-    # Add nodes first to ensure all tasks from the dict are included
-    for task_name, data in tasks_copy.items():
-        G.add_node(task_name, **data)
-    # Add edges, which might add nodes if they weren't in tasks_copy (less likely now)
-    G.add_edges_from(dependencies_copy)
-    # Re-apply attributes just in case some nodes were added implicitly by edges
-    # (though the first loop should prevent this)
-    for task_name, data in tasks_copy.items():
-        if task_name in G:
-            G.nodes[task_name].update(data)
-        else:
-            # This case should be rare now but good to keep the warning
-            log.warning(
-                f"Task '{task_name}' defined in tasks dict but not present in graph nodes after processing dependencies."
-            )
+    # Add nodes first (in bulk, with their attribute dicts) to ensure all
+    # tasks from the dict are included
+    G.add_nodes_from(tasks_copy.items())
+    # Add edges; only predecessors missing from tasks_copy become new nodes,
+    # existing nodes keep their attributes
+    G.add_edges_from(dependencies)
 
     # 2. Optionally add global START/END nodes
     if add_start_end_nodes:
-        # This function might modify tasks_copy, dependencies_copy, stream_map_copy
-        G, tasks_copy, stream_map_copy = add_global_start_end(
-            G, tasks_copy, stream_map_copy
-        )
-        log.debug('Added global START and END nodes.')
+        if START_NODE in G or END_NODE in G:
+            # Caller's tasks already include them; skip the root/leaf scan
+            log.debug('START/END nodes already present in tasks.')
+        else:
+            # add_global_start_end modifies tasks and stream_map in place,
+            # so hand it copies to leave the caller's data untouched
+            G, tasks_copy, stream_map_copy = add_global_start_end(
+                G, tasks.copy(), stream_map.copy()
+            )
+            log.debug('Added global START and END nodes.')
 
     # --- Check if graph is empty ---
     if not G.nodes:
@@ -110,67 +200,40 @@ def plot_project_gantt(
 
     # 3. Layout Calculations
     # *** Ensure base is calculated from midnight ***
-    project_start_midnight = datetime(
-        project_start_date.year,
-        project_start_date.month,
-        project_start_date.day,
-        0,
-        0,
-        0,
-    )
+    # combine() keeps only the calendar date, like datetime(y, m, d) (naive)
+    project_start_midnight = datetime.combine(project_start_date, time.min)
     project_start_num_base = mdates.date2num(project_start_midnight)
     # *** End of base calculation adjustment ***
 
     # Use the potentially modified stream_map_copy
     unique_chains = sorted(list(set(stream_map_copy.values())))
     stream_levels = {chain: i for i, chain in enumerate(unique_chains)}
-    y_levels = {}
-    for task_name in G.nodes():
-        # Use the potentially modified stream_map_copy
-        chain = stream_map_copy.get(task_name)
-        if chain is not None and chain in stream_levels:
-            y_levels[task_name] = -stream_levels[chain]
-        else:
-            # Assign a default level if chain is missing or not in map
-            log.warning(
-                f"Warning: Task '{task_name}' missing chain or chain not found in stream_map. Assigning default y=0."
-            )
-            # Ensure task_name exists in y_levels even if chain is missing
-            if task_name not in y_levels:
-                y_levels[task_name] = 0  # Assign a default level
+    # Topological lanes: dependency layer per task, labelled 'Layer n'
+    task_layers = topological_layers(G) if lane_layout == 'topological' else None
 
     # 4. Calculate Date Range for Plotting
     # Use the potentially modified tasks_copy
-    all_starts = [
-        data['start']
-        for data in tasks_copy.values()
-        if isinstance(data.get('start'), datetime)
-    ]
-    all_ends = [
-        data['end']
-        for data in tasks_copy.values()
-        if isinstance(data.get('end'), datetime)
-    ]
-
-    if not all_starts and not all_ends:
+    min_start, max_start, min_end, max_end = task_date_bounds(tasks_copy)
+
+    if min_start is None and min_end is None:
         # Handle case with no valid dates at all
         min_date = project_start_date
         max_date = min_date + timedelta(days=7)  # Default range
         log.warning(
             'Warning: No valid start/end dates found in tasks. Using default date range based on project start.'
         )
-    elif not all_starts:
+    elif min_start is None:
         # Only end dates available
-        min_date = min(all_ends) - timedelta(days=1)  # Estimate start
-        max_date = max(all_ends)
-    elif not all_ends:
+        min_date = min_end - timedelta(days=1)  # Estimate start
+        max_date = max_end
+    elif min_end is None:
         # Only start dates available
-        min_date = min(all_starts)
-        max_date = max(all_starts) + timedelta(days=1)  # Estimate end
+        min_date = min_start
+        max_date = max_start + timedelta(days=1)  # Estimate end
     else:
         # Both available
-        min_date = min(all_starts)
-        max_date = max(all_ends)
+        min_date = min_start
+        max_date = max_end
 
     # Add buffer for plotting limits
     plot_start_date = min_date - timedelta(days=1)
@@ -184,264 +247,337 @@ def plot_project_gantt(
     # --- Add Weekend Shading (if standard calendar) ---
     if calendar_type == 'standard':
         log.info('Applying weekend shading...')
-        iter_start_date = datetime(
-            plot_start_date.year, plot_start_date.month, plot_start_date.day
+        iter_start_date = datetime.combine(plot_start_date, time.min)
+        iter_end_limit = datetime.combine(plot_limit_end_date, time.min) + timedelta(
+            days=1
+        )
+
+        # Date numbers are in days, so convert the first midnight once and
+        # derive every day number and weekday from its offset
+        iter_start_num = mdates.date2num(iter_start_date)
+        day_offsets = np.arange((iter_end_limit - iter_start_date).days)
+        is_weekend = (iter_start_date.weekday() + day_offsets) % 7 >= 5
+        # Merge each Saturday and Sunday into one span (runs of weekend days)
+        run_edges = np.diff(np.concatenate(([0], is_weekend.astype(np.int8), [0])))
+        run_starts = np.flatnonzero(run_edges == 1)
+        run_lengths = np.flatnonzero(run_edges == -1) - run_starts
+        # One collection spanning the full axes height (x in data, y in axes
+        # coordinates, like axvspan) instead of one patch per weekend day
+        ax.add_collection(
+            PolyCollection(
+                _bar_vertices(iter_start_num + run_starts, run_lengths, 0.5, 1.0),
+                transform=ax.get_xaxis_transform(),
+                facecolors='lightgray',
+                edgecolors='none',
+                alpha=0.3,
+                zorder=-1,
+            ),
+            autolim=False,
         )
-        iter_end_limit = datetime(
-            plot_limit_end_date.year, plot_limit_end_date.month, plot_limit_end_date.day
-        ) + timedelta(days=1)
-
-        current_date = iter_start_date
-        while current_date < iter_end_limit:
-            weekday = current_date.weekday()
-            if weekday >= 5:  # Saturday (5) or Sunday (6)
-                day_start_dt = datetime(
-                    current_date.year, current_date.month, current_date.day, 0, 0, 0
-                )
-                day_end_dt = day_start_dt + timedelta(days=1)
-                day_start_num = mdates.date2num(day_start_dt)
-                day_end_num = mdates.date2num(day_end_dt)
-                ax.axvspan(
-                    day_start_num,
-                    day_end_num,
-                    facecolor='lightgray',
-                    alpha=0.3,
-                    zorder=-1,
-                )
-            current_date += timedelta(days=1)
     # --- End Weekend Shading ---
 
-    # Plot Bars
-    plotted_task_names = set()  # Keep track of tasks actually plotted
-    # Iterate using the potentially modified tasks_copy
+    # Struct-of-arrays view of the drawable tasks: index i of every array
+    # below describes task_names[i]
+    task_names = []
+    task_rows = []
     for task_name, data in tasks_copy.items():
-        # Ensure task exists in the graph and has a y-level before plotting
-        if task_name not in G or task_name not in y_levels:
+        # Ensure task exists in the graph before plotting
+        if task_name not in G:
             log.debug(
-                f"Skipping plot for task '{task_name}' as it's not in the graph or y_levels."
+                "Skipping plot for task '%s' as it's not in the graph.",
+                task_name,
             )
             continue
-
-        if isinstance(data.get('start'), datetime) and isinstance(
-            data.get('end'), datetime
+        row = _task_row(data)
+        if isinstance(row[0], datetime) and isinstance(row[1], datetime):
+            task_names.append(task_name)
+            task_rows.append(row)
+        elif not (
+            add_start_end_nodes and (task_name == START_NODE or task_name == END_NODE)
         ):
-            start_num = mdates.date2num(data['start'])
-            end_num = mdates.date2num(data['end'])
-            y = y_levels[task_name]  # Use pre-calculated y_level
-            task_type = data.get('type', TaskType.UNASSIGNED)
-            color = TASK_COLORS.get(task_type, TASK_COLORS[TaskType.UNASSIGNED])
-            task_url = data.get('url', None)
-
-            total_duration_td = data.get('total_duration', timedelta(0))
-            completed_duration_td = data.get('completed_duration', timedelta(0))
-            has_remaining_data = data.get('has_remaining_data', False)
-            task_tags = data.get('tags', [])
-
-            # --- Special handling for START/END nodes (if added) ---
-            if add_start_end_nodes and (
-                task_name == START_NODE or task_name == END_NODE
-            ):
-                plotted_task_names.add(task_name)  # Mark as plotted
-                # Plot START/END as markers (e.g., circles)
-                marker = 'o'  # Circle marker
-                marker_size = 8
-                ax.plot(
-                    start_num,  # Position at the start date
-                    y,
-                    marker,
-                    markersize=marker_size,
-                    color=color,  # Use SYSTEM color
-                    markeredgecolor='black',
-                    zorder=3,  # Ensure visible
-                )
-                # Add label slightly offset
-                label_text = task_name  # Just START or END
-                ha_align = 'right' if task_name == START_NODE else 'left'
-                offset = -0.05 if task_name == START_NODE else 0.05
-                ax.text(
-                    start_num + offset,
-                    y,
-                    label_text,
-                    va='center',
-                    ha=ha_align,
-                    fontsize=9,
-                    fontweight='bold',
-                    color='black',
-                    zorder=4,
-                )
-            # --- Regular Task Plotting (Bars or Milestones) ---
-            elif total_duration_td > timedelta(0):  # Regular task with duration
-                plotted_task_names.add(task_name)  # Mark as plotted
-                main_bar_height = 0.5
-                bar_total = ax.barh(
-                    y,
-                    total_duration_td.total_seconds() / (24 * 3600),
-                    left=start_num,
-                    height=main_bar_height,
-                    color=color,
-                    edgecolor='k',
-                    alpha=0.5,
-                    zorder=2,
-                )
-                if task_url:
-                    bar_total[0].set_url(task_url)
-
-                # Draw Progress Bar
-                if has_remaining_data and completed_duration_td > timedelta(0):
-                    completed_width_days = completed_duration_td.total_seconds() / (
-                        24 * 3600
-                    )
-                    progress_bar_height = 0.1
-                    y_progress = (y - main_bar_height / 2) + (progress_bar_height / 2)
-                    ax.barh(
-                        y_progress,
-                        completed_width_days,
-                        left=start_num,
-                        height=progress_bar_height,
-                        color=color,
-                        edgecolor=None,
-                        alpha=1.0,
-                        zorder=3,
-                    )
-
-                # Text Label
-                task_id = data.get('id', '?')
-                resources = data.get('resources', '')
-                label_text = f'{task_id} {task_name}'
-                if resources:
-                    label_text += f' ({resources})'
-                text_label = ax.text(
-                    start_num + (total_duration_td.total_seconds() / (24 * 3600)) / 2,
-                    y,
-                    label_text,
-                    va='center',
-                    ha='center',
-                    fontsize=8,
-                    color='black',
-                    zorder=4,
-                )
-                if task_url:
-                    text_label.set_url(task_url)
-
-                # Add Tags Text
-                if task_tags:
-                    tags_str = ' '.join([f'#{tag}' for tag in task_tags])
-                    ax.text(
-                        end_num,
-                        y,
-                        tags_str,
-                        ha='right',
-                        va='center',
-                        fontsize=6,
-                        color='white',
-                        zorder=5,
-                        bbox=dict(
-                            facecolor='black',
-                            alpha=0.4,
-                            pad=1,
-                            boxstyle='round,pad=0.1',
-                        ),
-                    )
-            elif total_duration_td <= timedelta(0):  # Zero Duration Task (Milestone)
-                plotted_task_names.add(task_name)  # Mark as plotted
-                ax.plot(
-                    start_num,  # Position at the start date
-                    y,
-                    'D',  # Diamond marker
-                    markersize=6,
-                    color=color,
-                    markeredgecolor='black',
-                    zorder=3,  # Ensure visible
+            log.warning(
+                "Skipping task '%s' due to missing or invalid start/end dates.",
+                task_name,
+            )
+    name_to_idx = {task_name: i for i, task_name in enumerate(task_names)}
+    (
+        starts,
+        ends,
+        task_ids,
+        total_durations,
+        completed_durations,
+        has_remaining_data,
+        task_types,
+        task_urls,
+        task_tags,
+        task_resources,
+    ) = zip(*task_rows, strict=True) if task_rows else ((),) * len(_TASK_FIELDS)
+    start_nums = np.asarray(mdates.date2num(list(starts)), dtype=float)
+    end_nums = np.asarray(mdates.date2num(list(ends)), dtype=float)
+    # Each chain is drawn on its own level, going down from 0
+    y_arr = np.empty(len(task_names), dtype=np.int32)
+    for i, task_name in enumerate(task_names):
+        if task_layers is not None:
+            y_arr[i] = -task_layers[task_name]  # Every node of G has a layer
+            continue
+        # Use the potentially modified stream_map_copy
+        chain = stream_map_copy.get(task_name)
+        if chain is not None and chain in stream_levels:
+            y_arr[i] = -stream_levels[chain]
+        else:
+            # Assign a default level if chain is missing or not in map
+            log.warning(
+                "Warning: Task '%s' missing chain or chain not found in stream_map. Assigning default y=0.",
+                task_name,
+            )
+            y_arr[i] = 0
+    duration_days = np.array(
+        [
+            td.total_seconds() / (24 * 3600) if td is not None else 0.0
+            for td in total_durations
+        ],
+        dtype=float,
+    )
+    # Resolve each colour name to RGBA once per task type, not once per task
+    type_rgba = {
+        task_type: mcolors.to_rgba(color) for task_type, color in TASK_COLORS.items()
+    }
+    default_rgba = type_rgba[TaskType.UNASSIGNED]
+    colors = np.array(
+        [type_rgba.get(task_type, default_rgba) for task_type in task_types],
+        dtype=float,
+    ).reshape(-1, 4)
+    is_system_node = np.array(
+        [
+            add_start_end_nodes and (task_name == START_NODE or task_name == END_NODE)
+            for task_name in task_names
+        ],
+        dtype=bool,
+    )
+    is_bar = ~is_system_node & (duration_days > 0)
+
+    # Plot Bars for regular tasks with duration as a single collection
+    bar_idx = np.flatnonzero(is_bar)
+    rasterize_bars = (
+        rasterize_bars_above is not None and bar_idx.size > rasterize_bars_above
+    )
+    if rasterize_bars:
+        log.info('Rasterizing %d task bars.', bar_idx.size)
+    if bar_idx.size:
+        main_bar_height = 0.5
+        bar_total = PolyCollection(
+            _bar_vertices(
+                start_nums[bar_idx],
+                duration_days[bar_idx],
+                y_arr[bar_idx],
+                main_bar_height,
+            ),
+            facecolors=colors[bar_idx],
+            edgecolors='k',
+            alpha=0.5,
+            zorder=2,
+            rasterized=rasterize_bars,
+        )
+        bar_total.set_urls([task_urls[i] for i in bar_idx])
+        ax.add_collection(bar_total)
+
+        # Draw Progress Bars
+        completed_days = np.array(
+            [completed_durations[i].total_seconds() / (24 * 3600) for i in bar_idx],
+            dtype=float,
+        )
+        has_progress = (completed_days > 0) & np.array(
+            [has_remaining_data[i] for i in bar_idx],
+            dtype=bool,
+        )
+        if has_progress.any():
+            progress_idx = bar_idx[has_progress]
+            progress_bar_height = 0.1
+            ax.add_collection(
+                PolyCollection(
+                    _bar_vertices(
+                        start_nums[progress_idx],
+                        completed_days[has_progress],
+                        y_arr[progress_idx]
+                        - main_bar_height / 2
+                        + progress_bar_height / 2,
+                        progress_bar_height,
+                    ),
+                    facecolors=colors[progress_idx],
+                    edgecolors='none',
+                    alpha=1.0,
+                    zorder=3,
+                    rasterized=rasterize_bars,
                 )
-                # Add label slightly offset from marker
-                task_id = data.get('id', '?')
-                label_text = f'{task_id} {task_name}'
-                ax.text(
-                    start_num,
+            )
+        ax.autoscale_view()
+
+    # Markers and labels
+    # (bar index, label) pairs; min_label_px is applied once the layout is final
+    bar_labels = []
+    # Shared by all labels of a kind; saves parsing font keywords per Text
+    label_font = FontProperties(size=8)
+    tag_font = FontProperties(size=6)
+    system_font = FontProperties(size=9, weight='bold')
+    # START/END circles and milestone diamonds are each drawn as one scatter
+    system_marker_idx = []
+    milestone_marker_idx = []
+    add_text = ax.text  # Bound once, called for most tasks below
+    # Plain Python lists index faster than NumPy arrays in a per-task loop
+    for i, (task_name, start_num, y) in enumerate(
+        zip(task_names, start_nums.tolist(), y_arr.tolist(), strict=True)
+    ):
+        # --- Special handling for START/END nodes (if added) ---
+        if is_system_node[i]:
+            # Plot START/END as markers (circles), see below the loop
+            system_marker_idx.append(i)
+            # Add label slightly offset
+            label_text = task_name  # Just START or END
+            ha_align = 'right' if task_name == START_NODE else 'left'
+            offset = -0.05 if task_name == START_NODE else 0.05
+            add_text(
+                start_num + offset,
+                y,
+                label_text,
+                va='center',
+                ha=ha_align,
+                fontproperties=system_font,
+                color='black',
+                zorder=4,
+            )
+        # --- Regular Task Labels ---
+        elif is_bar[i]:
+            task_url = task_urls[i]
+            tags = task_tags[i]
+
+            # Text Label
+            resources = task_resources[i]
+            label_text = f'{task_ids[i]} {task_name}'
+            if resources:
+                label_text += f' ({resources})'
+            text_label = add_text(
+                start_num + duration_days[i] / 2,
+                y,
+                label_text,
+                va='center',
+                ha='center',
+                fontproperties=label_font,
+                color='black',
+                zorder=4,
+            )
+            if task_url:
+                text_label.set_url(task_url)
+            bar_labels.append((i, text_label))
+
+            # Add Tags Text
+            if tags:
+                tags_str = ' '.join([f'#{tag}' for tag in tags])
+                tag_label = add_text(
+                    end_nums[i],
                     y,
-                    f' {label_text}',  # Add space for offset
+                    tags_str,
+                    ha='right',
                     va='center',
-                    ha='left',  # Align left of the marker point
-                    fontsize=8,
-                    color='black',
-                    zorder=4,
+                    fontproperties=tag_font,
+                    color='white',
+                    zorder=5,
+                    bbox=_TAG_BBOX,
                 )
-            # --- End Regular Task Plotting ---
+                bar_labels.append((i, tag_label))
+        else:  # Zero Duration Task (Milestone)
+            milestone_marker_idx.append(i)  # Diamond marker, see below the loop
+            # Add label slightly offset from marker
+            label_text = f'{task_ids[i]} {task_name}'
+            add_text(
+                start_num,
+                y,
+                f' {label_text}',  # Add space for offset
+                va='center',
+                ha='left',  # Align left of the marker point
+                fontproperties=label_font,
+                color='black',
+                zorder=4,
+            )
 
-        else:
-            # Log warning only if it's not one of the potentially added START/END nodes
-            # (as they might have valid dates but we handle them separately above)
-            is_start_end = add_start_end_nodes and (
-                task_name == START_NODE or task_name == END_NODE
+    for marker_idx, marker, marker_size in (
+        (system_marker_idx, 'o', 8),
+        (milestone_marker_idx, 'D', 6),
+    ):
+        if marker_idx:
+            ax.scatter(
+                start_nums[marker_idx],  # Position at the start date
+                y_arr[marker_idx],
+                s=marker_size**2,  # scatter sizes are in points squared
+                marker=marker,
+                c=colors[marker_idx],
+                edgecolors='black',
+                linewidths=mpl.rcParams['lines.markeredgewidth'],
+                zorder=3,  # Ensure visible
             )
-            if not is_start_end:
-                log.warning(
-                    f"Skipping task '{task_name}' due to missing or invalid start/end dates."
-                )
 
     # Draw Dependency Arrows
+    # Curved (arc3) arrows are laid out in display space at draw time, so each
+    # edge needs its own FancyArrowPatch; adding the bare patch avoids the
+    # extra Annotation text artist that ax.annotate would create per edge.
     arrowprops = dict(
         arrowstyle='->', color='gray', lw=1, connectionstyle='arc3,rad=0.1'
     )
+    edge_src = []
+    edge_dst = []
     for u, v in G.edges():
-        # Check if edge source/target were actually plotted and have y_levels
-        if (
-            u not in plotted_task_names
-            or v not in plotted_task_names
-            or u not in y_levels
-            or v not in y_levels
-        ):
+        # Check if edge source/target were actually plotted
+        iu = name_to_idx.get(u)
+        iv = name_to_idx.get(v)
+        if iu is None or iv is None:
             log.debug(
-                f'Skipping arrow for edge {u}->{v} as one or both tasks were not plotted or lack y-level.'
-            )
-            continue
-
-        # Ensure tasks exist in the main tasks dictionary to get date info
-        # Use tasks_copy here as it contains START/END if they were added
-        if u not in tasks_copy or v not in tasks_copy:
-            log.warning(
-                f"Skipping arrow for edge {u}->{v} due to missing task data in the 'tasks_copy' dictionary."
+                'Skipping arrow for edge %s->%s as one or both tasks were not plotted or lack y-level.',
+                u,
+                v,
             )
             continue
-
-        data_u = tasks_copy[u]
-        data_v = tasks_copy[v]
-        y_level_u = y_levels[u]
-        y_level_v = y_levels[v]
-
-        # Check for valid dates before calculating arrow positions
-        if isinstance(data_u.get('end'), datetime) and isinstance(
-            data_v.get('start'), datetime
-        ):
-            # Determine start point x-coordinate
-            # Use 'start' date for zero-duration tasks (milestones, START/END)
-            is_u_zero_dur = data_u.get('total_duration', timedelta(1)) <= timedelta(0)
-            is_u_start_node = add_start_end_nodes and u == START_NODE
-            x_start_date = (
-                data_u['start'] if (is_u_zero_dur or is_u_start_node) else data_u['end']
-            )
-            x_start = mdates.date2num(x_start_date)
-
-            # Determine end point x-coordinate (always 'start' of the successor)
-            x_end = mdates.date2num(data_v['start'])
-
-            y_start = y_level_u
-            y_end = y_level_v
-
-            # Avoid drawing zero-length arrows if start/end points are identical
-            # Use a small tolerance for floating point comparisons
-            if abs(x_start - x_end) > 1e-6 or abs(y_start - y_end) > 1e-6:
-                ax.annotate(
-                    '',
-                    xy=(x_end, y_end),
-                    xytext=(x_start, y_start),
-                    arrowprops=arrowprops,
-                    zorder=1,  # Draw arrows behind bars/markers
-                )
-        else:
-            log.warning(
-                f'Warning: Missing valid start/end dates for dependency {u}->{v}. Skipping arrow.'
+        edge_src.append(iu)
+        edge_dst.append(iv)
+    edge_src = np.asarray(edge_src, dtype=np.intp)
+    edge_dst = np.asarray(edge_dst, dtype=np.intp)
+
+    # Arrow geometry for all edges at once. Arrows leave zero-duration tasks
+    # (milestones, START/END) at their 'start' date and other tasks at 'end';
+    # they always point at the 'start' of the successor. Unlike for bars, a
+    # task without 'total_duration' counts as having a duration here.
+    leaves_from_start = (
+        np.array(
+            [td is not None and td <= timedelta(0) for td in total_durations],
+            dtype=bool,
+        )
+        | is_system_node
+    )
+    x_starts = np.where(
+        leaves_from_start[edge_src], start_nums[edge_src], end_nums[edge_src]
+    )
+    x_ends = start_nums[edge_dst]
+    y_starts = y_arr[edge_src]
+    y_ends = y_arr[edge_dst]
+    # Avoid drawing zero-length arrows if start/end points are identical
+    # Use a small tolerance for floating point comparisons
+    has_length = (np.abs(x_starts - x_ends) > 1e-6) | (np.abs(y_starts - y_ends) > 1e-6)
+    for x_start, y_start, x_end, y_end in zip(
+        x_starts[has_length].tolist(),
+        y_starts[has_length].tolist(),
+        x_ends[has_length].tolist(),
+        y_ends[has_length].tolist(),
+        strict=True,
+    ):
+        ax.add_artist(
+            mpatches.FancyArrowPatch(
+                (x_start, y_start),
+                (x_end, y_end),
+                # ax.annotate scales arrow heads by the default font size
+                mutation_scale=mpl.rcParams['font.size'],
+                clip_on=False,
+                zorder=1,  # Draw arrows behind bars/markers
+                **arrowprops,
             )
+        )
 
     # 6. Configure Axes
     ax.set_xlim(plot_start_num, plot_limit_end_num)
@@ -470,15 +606,14 @@ def plot_project_gantt(
     ax.grid(True, axis='x', linestyle='--', alpha=0.6)
 
     # --- Configure Y-axis Ticks ---
-    # Filter y_levels to only include tasks that were actually plotted
-    plotted_y_levels = {
-        task: y for task, y in y_levels.items() if task in plotted_task_names
-    }
-    if plotted_y_levels:
-        unique_plotted_y_values = sorted(list(set(plotted_y_levels.values())))
+    if task_names:
+        unique_plotted_y_values = np.unique(y_arr)  # Sorted levels of plotted tasks
         ax.set_yticks(unique_plotted_y_values)
         # Use the potentially modified stream_map_copy for labels
-        level_to_chain = {lvl: chain for chain, lvl in stream_levels.items()}
+        if task_layers is not None:
+            level_to_chain = {-y: f'Layer {-y}' for y in unique_plotted_y_values}
+        else:
+            level_to_chain = {lvl: chain for chain, lvl in stream_levels.items()}
         y_tick_labels = [
             level_to_chain.get(-y, f'Level {-y}')  # Get chain name from level
             for y in unique_plotted_y_values
@@ -487,7 +622,7 @@ def plot_project_gantt(
     else:
         ax.set_yticks([])  # No ticks if nothing was plotted
         ax.set_yticklabels([])
-    ax.set_ylabel('Task Chain')
+    ax.set_ylabel('Dependency Layer' if task_layers is not None else 'Task Chain')
     # --- End Y-axis Ticks ---
 
     fig.autofmt_xdate(rotation=30, ha='right')
@@ -495,21 +630,24 @@ def plot_project_gantt(
     # --- Add Vertical Line for Publish Date ---
     if project_publish_date and not is_synthetic_start_date:
         publish_date_num = mdates.date2num(project_publish_date)
+        publish_date_str = f'{project_publish_date:%Y-%m-%d}'  # Formatted once
         if plot_start_num < publish_date_num < plot_limit_end_num:
             ax.axvline(
                 x=publish_date_num,
                 color='blue',
                 linestyle='--',
                 linewidth=1.5,
-                label=f"Publish Date ({project_publish_date.strftime('%Y-%m-%d')})",
+                label=f'Publish Date ({publish_date_str})',
                 zorder=10,
             )
             log.info(
-                f"Adding vertical line for publish date: {project_publish_date.strftime('%Y-%m-%d')}"
+                'Adding vertical line for publish date: %s',
+                publish_date_str,
             )
         else:
             log.warning(
-                f"Publish date {project_publish_date.strftime('%Y-%m-%d')} is outside the plot range, not drawing line."
+                'Publish date %s is outside the plot range, not drawing line.',
+                publish_date_str,
             )
     # --- End Vertical Line ---
 
@@ -552,12 +690,10 @@ def plot_project_gantt(
         ax.get_legend_handles_labels()
     )  # Get handles from axvline if present
     type_legend_handles = []
-    # Determine used types from the *actually plotted* tasks in tasks_copy
-    used_types = set(
-        tasks_copy[task_name]['type']
-        for task_name in plotted_task_names
-        if task_name in tasks_copy and 'type' in tasks_copy[task_name]
-    )
+    # Determine used types from the *actually plotted* tasks (every drawable
+    # task gets plotted); tasks without a type add no legend entry
+    used_types = set(task_types)
+    used_types.discard(None)
     for task_type in TaskType:
         # Only add legend entry if the type was actually used
         # If START/END nodes were not added, SYSTEM type won't be in used_types
@@ -582,6 +718,18 @@ def plot_project_gantt(
         )
         plt.subplots_adjust(right=0.85)  # Adjust plot to make space for legend
 
+    if min_label_px is not None and bar_labels:
+        # Measure on the final layout: xlim, autofmt_xdate and the legend
+        # margin all change how many pixels a day spans
+        px_per_day = (
+            ax.transData.transform((1, 0))[0] - ax.transData.transform((0, 0))[0]
+        )
+        is_narrow = duration_days * px_per_day < min_label_px
+        narrow_labels = [label for i, label in bar_labels if is_narrow[i]]
+        for label in narrow_labels:
+            label.remove()
+        log.debug('Removed %d labels of narrow bars.', len(narrow_labels))
+
     log.info('Gantt plot generation complete.')
 
     return fig
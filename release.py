@@ -3,36 +3,100 @@ This script automates the process of updating the version number in a Python pac
 It also includes commented-out lines for building a package and uploading it to PyPI.
 """
 
+import functools
 import os
+import re
+import shutil
 import subprocess
 import datetime
 import tomllib
+from concurrent.futures import ThreadPoolExecutor
 import requests
 import sys
 from semver.version import Version
 
+# Lines of src/__init__.py rewritten on release, matched in a single pass
+RELEASE_LINE_RE = re.compile(r'^(__version__|__release_date__)\b.*$', re.MULTILINE)
 
-def get_version():
+
+@functools.lru_cache(maxsize=1)
+def load_pyproject():
+    """Parses pyproject.toml once; later calls return the same data."""
     with open('pyproject.toml', 'rb') as f:
-        pyproject_data = tomllib.load(f)
-        return pyproject_data['project']['version']
+        return tomllib.load(f)
+
+
+def get_version():
+    return load_pyproject()['project']['version']
 
 
 def get_pypi_version(package_name):
     url = f'https://pypi.org/pypi/{package_name}/json'
-    response = requests.get(url)
+    # (connect, read) timeouts in seconds, so an unresponsive PyPI cannot
+    # hang the release
+    response = requests.get(url, timeout=(3.05, 10))
     if response.status_code != 200:
         return None
     data = response.json()
     return data['info']['version']
 
 
+def get_current_branch():
+    """Returns the checked out branch name, or '' for a detached HEAD.
+
+    Reads .git/HEAD instead of running `git branch --show-current`. In a
+    worktree or submodule .git is a file pointing at the real git directory.
+    """
+    git_dir = '.git'
+    if os.path.isfile(git_dir):
+        with open(git_dir, 'r') as f:
+            git_dir = f.read().strip().removeprefix('gitdir:').strip()
+    with open(os.path.join(git_dir, 'HEAD'), 'r') as f:
+        head = f.read().strip()
+    return head.removeprefix('ref: refs/heads/') if head.startswith('ref:') else ''
+
+
 def main():
-    with open('pyproject.toml', 'rb') as f:
-        pyproject_data = tomllib.load(f)
-        package_name = pyproject_data['project']['name']
-    published_version = Version.parse(get_pypi_version(package_name))
+    package_name = load_pyproject()['project']['name']
     next_version = Version.parse(get_version())
+
+    # Local checks come first, so a run that cannot release exits before
+    # the PyPI request and before any file is modified.
+    # Ensure we are in the develop branch
+    current_branch = get_current_branch()
+    if current_branch != 'develop':
+        print(
+            f'Not in develop branch. Currently {current_branch} In order to release, please checkout the develop branch.'
+        )
+        sys.exit(1)
+    print('In develop branch. Proceeding with the release process.')
+
+    # A local tag means this version was already released (or a release was
+    # interrupted after tagging); stop before compiling, testing and building
+    tag_check = subprocess.run(
+        ['git', 'rev-parse', '--quiet', '--verify', f'refs/tags/v{next_version}'],
+        capture_output=True,
+    )
+    if tag_check.returncode == 0:
+        print(
+            f'Tag v{next_version} already exists locally. Bump the version in pyproject.toml to release.'
+        )
+        return
+
+    today_date = datetime.date.today()  # Read the clock once for the whole release
+    today = today_date.strftime('%Y-%m-%d')
+
+    # Make sure that this file has modified date of today
+    # as we expect the changelog to be update now.
+    current_filename = os.path.abspath(__file__)
+    last_modified_date = datetime.date.fromtimestamp(os.path.getmtime(current_filename))
+    if last_modified_date != today_date:
+        print(
+            f'The file {current_filename} was last modified on {last_modified_date}, not today.\nHave you added the changelog to the file?'
+        )
+        return
+
+    published_version = Version.parse(get_pypi_version(package_name))
     if published_version is None:
         print(
             f'No version found on PyPI. Proceeding with the release of version {next_version}.'
@@ -50,18 +114,6 @@ def main():
             f'Version {next_version} is newer than the published version {published_version}. Proceeding with the release.'
         )
 
-    today = datetime.date.today().strftime('%Y-%m-%d')
-
-    # Make sure that this file has modified date of today
-    # as we expect the changelog to be update now.
-    current_filename = os.path.abspath(__file__)
-    last_modified_date = datetime.date.fromtimestamp(os.path.getmtime(current_filename))
-    if last_modified_date != datetime.date.today():
-        print(
-            f'The file {current_filename} was last modified on {last_modified_date}, not today.\nHave you added the changelog to the file?'
-        )
-        return
-
     changelog = f"""
     ## [{next_version}] - {today}
     ### Added
@@ -87,16 +139,18 @@ def main():
     init_file_path = os.path.join('.', 'src', '__init__.py')
     if os.path.exists(init_file_path):
         with open(init_file_path, 'r') as f:
-            lines = f.readlines()
-
-        with open(init_file_path, 'w') as f:
-            for line in lines:
-                if line.startswith('__version__'):
-                    f.write(f'__version__ = "{next_version}"\n')
-                elif line.startswith('__release_date__'):
-                    f.write(f'__release_date__ = "{datetime.date.today()}"\n')
-                else:
-                    f.write(line)
+            init_source = f.read()
+        release_values = {'__version__': next_version, '__release_date__': today}
+        init_source = RELEASE_LINE_RE.sub(
+            lambda match: f'{match.group(1)} = "{release_values[match.group(1)]}"',
+            init_source,
+        )
+        # Write a temporary file and swap it in, so an interrupted release
+        # never leaves a half-written __init__.py behind
+        tmp_file_path = init_file_path + '.tmp'
+        with open(tmp_file_path, 'w') as f:
+            f.write(init_source)
+        os.replace(tmp_file_path, init_file_path)
     else:
         print(f'File {init_file_path} does not exist. Creating a new one.')
         with open(init_file_path, 'w') as f:
@@ -104,139 +158,139 @@ def main():
                 '"""Task Resource Manager\n\nA Tkinter application for managing tasks and resources with timeline visualization."""\n\n'
             )
             f.write(f'__version__ = "{next_version}"\n')
-            f.write(f'__release_date__ = "{datetime.date.today()}"\n')
+            f.write(f'__release_date__ = "{today}"\n')
             f.write('__author__ = "R.N. Wolf"\n')
 
-    # Update CHANGELOG.md
-    if os.path.exists('CHANGELOG.md'):
-        with open('CHANGELOG.md', 'r') as file:
-            existing_content = file.read()
-    else:
-        existing_content = ''
-
-    with open('CHANGELOG.md', 'w') as file:
-        file.write(changelog + '\n' + existing_content)
+    # Update CHANGELOG.md: write the new entry to a temporary file, stream
+    # the existing entries after it and swap the result in
+    with open('CHANGELOG.md.tmp', 'w') as file:
+        file.write(changelog + '\n')
+        if os.path.exists('CHANGELOG.md'):
+            with open('CHANGELOG.md', 'r') as existing_file:
+                shutil.copyfileobj(existing_file, file)
+    os.replace('CHANGELOG.md.tmp', 'CHANGELOG.md')
 
-    # Ensure we are in the develop branch
-    current_branch = subprocess.check_output(
-        ['git', 'branch', '--show-current'], text=True
-    ).strip()
-    if current_branch != 'develop':
-        print(
-            f'Not in develop branch. Currently {current_branch} In order to release, please checkout the develop branch.'
+    # Run tests and check that the distribution builds. Neither depends
+    # on the other, so they run at the same time. Test output goes
+    # straight to the console to show progress; the build output is
+    # captured so it does not interleave and is only shown on failure.
+    print('Run automated Tests and check distribution builds. Please wait.')
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        test_future = executor.submit(subprocess.run, ['uv', 'run', 'run_tests.py'])
+        build_future = executor.submit(
+            subprocess.run, ['uv', 'build'], capture_output=True, text=True
         )
-        sys.exit(1)
-    else:
-        print('In develop branch. Proceeding with the release process.')
 
-        # Run tests
-        print('Run automated Tests. Please wait.')
-        result = subprocess.run(
-            ['uv', 'run', 'run_tests.py'], capture_output=True, text=True
-        )
+    result = test_future.result()
+    if result.returncode != 0:
+        print('Tests failed (see output above). Aborting release.')
+        return
+    else:
+        print('Tests passed. Continuing with the release process.')
 
+        # Check that build runs successfully
+        result = build_future.result()
         if result.returncode != 0:
-            print('Tests failed. Aborting release.')
+            print('Distribution Build failed. Aborting release.')
             print(result.stdout)
             print(result.stderr)
             return
         else:
-            print('Tests passed. Continuing with the release process.')
+            print('Build passed. Continuing with the release process.')
+
+            print(
+                'Add files that change during release process to release. Continuing with the release process.'
+            )
+            subprocess.run(
+                [
+                    'git',
+                    'add',
+                    'pyproject.toml',
+                    'CHANGELOG.md',
+                    'README.md',
+                    'release.py',
+                    r'.\src\__init__.py',
+                    'requirements.txt',
+                    'uv.lock',
+                ]
+            )
+            print(
+                'Files added and staged for release. Continuing with the release process.'
+            )
+
+            print('Commit staged files. Continuing with the release process.')
+            subprocess.run(
+                [
+                    'git',
+                    'commit',
+                    '-m',
+                    f'Release version {next_version} on {today}',
+                ]
+            )
 
-            # Check that build runs successfully
-            print('Check distribution builds. Please wait.')
-            result = subprocess.run(['uv', 'build'], capture_output=True, text=True)
+            print('Creating new release tag')
+            result = subprocess.run(
+                [
+                    'git',
+                    'tag',
+                    '-a',
+                    f'v{next_version}',
+                    '-m',
+                    f'Release version {next_version} on {today}',
+                ]
+            )
             if result.returncode != 0:
-                print('Distribution Build failed. Aborting release.')
+                print(
+                    'Creating new release tag failed. Aborting release. Please resolve conflicts.'
+                )
                 print(result.stdout)
                 print(result.stderr)
-                return
+                sys.exit(1)
             else:
-                print('Build passed. Continuing with the release process.')
-
-                print(
-                    'Add files that change during release process to release. Continuing with the release process.'
-                )
-                subprocess.run(
-                    [
-                        'git',
-                        'add',
-                        'pyproject.toml',
-                        'CHANGELOG.md',
-                        'README.md',
-                        'release.py',
-                        r'.\src\__init__.py',
-                        'requirements.txt',
-                        'uv.lock',
-                    ]
-                )
-                print(
-                    'Files added and staged for release. Continuing with the release process.'
-                )
-
-                print('Commit staged files. Continuing with the release process.')
-                subprocess.run(
-                    [
-                        'git',
-                        'commit',
-                        '-m',
-                        f'Release version {next_version} on {today}',
-                    ]
-                )
-
-                print('Creating new release tag')
-                result = subprocess.run(
-                    [
-                        'git',
-                        'tag',
-                        '-a',
-                        f'v{next_version}',
-                        '-m',
-                        f'Release version {next_version} on {today}',
-                    ]
-                )
+                print('Merge develop into main branch')
+                subprocess.run(['git', 'switch', 'main'])
+                result = subprocess.run(['git', 'merge', 'develop'])
                 if result.returncode != 0:
                     print(
-                        'Creating new release tag failed. Aborting release. Please resolve conflicts.'
+                        'Merge from develop to main failed. Aborting release. Please resolve conflicts.'
+                    )
+                    print(
+                        f'Nothing has been pushed yet. After resolving, run: git push -u origin develop main refs/tags/v{next_version}'
                     )
                     print(result.stdout)
                     print(result.stderr)
                     sys.exit(1)
                 else:
-                    print('Pushing tag to remote repo develop branch')
-                    subprocess.run(['git', 'push', '-u', 'origin', 'develop'])
-
-                    print('Merge develop into main branch')
-                    subprocess.run(['git', 'switch', 'main'])
-                    result = subprocess.run(['git', 'merge', 'develop'])
-                    if result.returncode != 0:
-                        print(
-                            'Merge from develop to main failed. Aborting release. Please resolve conflicts.'
-                        )
-                        print(result.stdout)
-                        print(result.stderr)
-                        sys.exit(1)
-                    else:
-                        print(
-                            'Pushing code and tags to main branch on the remote repo in GitHub'
-                        )
-                        subprocess.run(
-                            ['git', 'push', '-u', 'origin', 'main', '--tags']
-                        )
-
-                        # Build and upload package to PyPI (uncomment if needed)
-                        # Install keyring to secure test.pypi token locally https://pypi.org/project/keyring/
-                        # See https://github.com/astral-sh/uv/issues/7963 for discussion on how to do a manual release for initial release
-                        #
-                        # keyring set https://upload.pypi.org/legacy/?our-planner __token__
-                        # Note: On MS-Windows you must use the Edit/Paste command in the menu to paste the token into the keyring prompt.
-                        #
-                        # uv publish --username __token__ --keyring-provider subprocess --publish-url https://upload.pypi.org/legacy/?our-planner
-                        #
-                        # Use GitHub actions to do the release automatically after configuring the token in the GitHub actions secrets after the first manual release
-                        print(
-                            'Github action will be triggered and rebuild the distribution to upload to github and PyPI.\nPlease make sure that the release is successful.'
-                        )
+                    # One push (a single connection to the remote) for both
+                    # branches and only the new release tag
+                    print(
+                        f'Pushing develop, main and tag v{next_version} to the remote repo in GitHub'
+                    )
+                    subprocess.run(
+                        [
+                            'git',
+                            'push',
+                            '-u',
+                            'origin',
+                            'develop',
+                            'main',
+                            f'refs/tags/v{next_version}',
+                        ]
+                    )
+
+                    # Build and upload package to PyPI (uncomment if needed)
+                    # Install keyring to secure test.pypi token locally https://pypi.org/project/keyring/
+                    # See https://github.com/astral-sh/uv/issues/7963 for discussion on how to do a manual release for initial release
+                    #
+                    # keyring set https://upload.pypi.org/legacy/?our-planner __token__
+                    # Note: On MS-Windows you must use the Edit/Paste command in the menu to paste the token into the keyring prompt.
+                    #
+                    # uv publish --username __token__ --keyring-provider subprocess --publish-url https://upload.pypi.org/legacy/?our-planner
+                    #
+                    # Use GitHub actions to do the release automatically after configuring the token in the GitHub actions secrets after the first manual release
+                    print(
+                        'Github action will be triggered and rebuild the distribution to upload to github and PyPI.\nPlease make sure that the release is successful.'
+                    )
 
 
 if __name__ == '__main__':
@@ -16,6 +16,9 @@ if __name__ == "__main__":
     # Add arguments for pytest
     pytest_args = [
         "--verbose",  # Verbose output
+        "--import-mode=importlib",  # Import test modules without editing sys.path
+        "--failed-first",  # Run the tests that failed last time first
+        "--exitfirst",  # Stop at the first failure
         # Add any other pytest arguments here
     ]
 
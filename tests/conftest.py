@@ -2,5 +2,23 @@ import pytest
 import sys
 import os
 
+import matplotlib
+
+# Render tests off-screen; must run before any test module imports pyplot
+matplotlib.use('Agg', force=True)
+# No warning while module-scoped fixtures and tests hold many open figures
+matplotlib.rcParams['figure.max_open_warning'] = 0
+
 # This allows importing the application modules from tests
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+
+def pytest_sessionstart(session):
+    # Load matplotlib's font cache and text machinery once up front, so
+    # --durations does not charge that cost to whichever plot test runs first
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure()
+    fig.text(0.5, 0.5, 'warm-up')
+    fig.canvas.draw()
+    plt.close(fig)
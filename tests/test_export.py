@@ -0,0 +1,97 @@
+import gzip
+import re
+import pytest
+import matplotlib.pyplot as plt
+
+from pyganttccpm.export import save_svg, show_png
+
+
+@pytest.fixture
+def simple_figure():
+    """Provides a small figure with a line and some text."""
+    fig, ax = plt.subplots()
+    ax.plot([0.123456, 1.987654], [2.5, 3.333333])
+    ax.set_title('Export Test')
+    yield fig
+    plt.close(fig)
+
+
+def test_save_svg_rounds_coordinates(simple_figure, tmp_path):
+    """Tests that path coordinates are written with the requested precision."""
+    svg_file = tmp_path / 'chart.svg'
+    save_svg(simple_figure, svg_file, precision=2)
+
+    svg_content = svg_file.read_text()
+    assert svg_content.startswith('<?xml')
+    path_data = ' '.join(re.findall(r'\sd="([^"]*)"', svg_content))
+    assert path_data
+    assert not re.search(r'\d+\.\d{3,}', path_data)
+    # Text is written as <text> elements rather than glyph paths
+    assert 'Export Test</text>' in svg_content
+
+
+@pytest.mark.parametrize('size_pt', [100.0, 99.6])
+def test_save_svg_rounds_to_whole_numbers(size_pt, tmp_path):
+    """Tests that precision=0 keeps the significant zeros of whole numbers."""
+    fig = plt.figure(figsize=(size_pt / 72, size_pt / 72))
+    svg_file = tmp_path / 'chart.svg'
+    save_svg(fig, svg_file, precision=0)
+    plt.close(fig)
+    # The figure background spans the whole figure, 100 x 100 points
+    assert ' d="M 0 100 L 100 100 L 100 0 L 0 0 z"' in svg_file.read_text()
+
+
+def test_save_svg_rejects_negative_precision(simple_figure, tmp_path):
+    """Tests that a negative precision is reported as a ValueError."""
+    with pytest.raises(ValueError, match='precision'):
+        save_svg(simple_figure, tmp_path / 'chart.svg', precision=-1)
+
+
+def test_save_svg_rounding_shrinks_output(simple_figure, tmp_path):
+    """Tests that rounding shrinks the output compared to full precision."""
+    rounded_file = tmp_path / 'rounded.svg'
+    full_file = tmp_path / 'full.svg'
+    save_svg(simple_figure, rounded_file, precision=1)
+    save_svg(simple_figure, full_file, precision=None)
+    assert rounded_file.stat().st_size < full_file.stat().st_size
+
+
+def test_save_svg_minify(simple_figure, tmp_path):
+    """Tests that minifying removes layout whitespace but keeps the text."""
+    minified_file = tmp_path / 'minified.svg'
+    pretty_file = tmp_path / 'pretty.svg'
+    save_svg(simple_figure, minified_file)
+    save_svg(simple_figure, pretty_file, minify=False)
+
+    minified = minified_file.read_text()
+    assert not re.search(r'>\s+<', minified)
+    assert not re.search(r'\sd="[^"]*\n', minified)
+    assert 'Export Test</text>' in minified
+    assert minified_file.stat().st_size < pretty_file.stat().st_size
+
+
+def test_save_svg_svgz_is_gzip_compressed(simple_figure, tmp_path):
+    """Tests that an .svgz destination holds the gzip-compressed SVG."""
+    svg_file = tmp_path / 'chart.svg'
+    svgz_file = tmp_path / 'chart.svgz'
+    save_svg(simple_figure, svg_file)
+    save_svg(simple_figure, svgz_file)
+
+    svg_content = gzip.decompress(svgz_file.read_bytes()).decode()
+    assert svg_content.startswith('<?xml')
+    assert 'Export Test</text>' in svg_content
+    assert svgz_file.stat().st_size < svg_file.stat().st_size
+
+
+def test_show_png_displays_raster_image(simple_figure, monkeypatch):
+    """Tests that show_png hands a PNG of the requested size to the viewer."""
+    from PIL import Image
+
+    shown = []
+    monkeypatch.setattr(Image.Image, 'show', lambda self: shown.append(self))
+    show_png(simple_figure, dpi=50)
+
+    assert len(shown) == 1
+    assert shown[0].format == 'PNG'
+    width_in, height_in = simple_figure.get_size_inches()
+    assert shown[0].size == (round(width_in * 50), round(height_in * 50))
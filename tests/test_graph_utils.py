@@ -1,7 +1,11 @@
 import pytest
 import networkx as nx
 from datetime import datetime, timedelta
-from pyganttccpm.graph_utils import add_global_start_end
+from pyganttccpm.graph_utils import (
+    add_global_start_end,
+    task_date_bounds,
+    topological_layers,
+)
 from pyganttccpm.config import START_NODE, END_NODE, TaskType
 
 
@@ -77,9 +81,54 @@ def test_add_start_end_empty_graph():
     G = nx.DiGraph()
     tasks = {}
     stream_map = {}
-    add_global_start_end(G, tasks, stream_map)
+    assert add_global_start_end(G, tasks, stream_map) == (G, tasks, stream_map)
     assert START_NODE not in G.nodes  # Should not add if graph is empty
     assert END_NODE not in G.nodes
 
 
+def test_add_start_end_twice():
+    """Tests that adding START/END to an augmented graph leaves it unchanged."""
+    G = nx.DiGraph()
+    tasks = {'A': {'start': datetime(2025, 1, 1), 'end': datetime(2025, 1, 2)}}
+    stream_map = {'A': 'C1'}
+    G.add_node('A', **tasks['A'])
+    add_global_start_end(G, tasks, stream_map)
+    edges = set(G.edges)
+
+    assert add_global_start_end(G, tasks, stream_map) == (G, tasks, stream_map)
+    assert set(G.edges) == edges
+
+
+def test_task_date_bounds():
+    """Tests the single-pass min/max date scan, including excluded and invalid entries."""
+    tasks = {
+        'A': {'start': datetime(2025, 1, 3), 'end': datetime(2025, 1, 4)},
+        'B': {'start': datetime(2025, 1, 1), 'end': datetime(2025, 1, 9)},
+        'C': {'start': None, 'end': 'not a date'},
+        START_NODE: {'start': datetime(2024, 12, 1), 'end': datetime(2024, 12, 1)},
+    }
+    assert task_date_bounds(tasks, exclude=(START_NODE,)) == (
+        datetime(2025, 1, 1),
+        datetime(2025, 1, 3),
+        datetime(2025, 1, 4),
+        datetime(2025, 1, 9),
+    )
+    assert task_date_bounds(tasks)[0] == datetime(2024, 12, 1)
+    assert task_date_bounds({'C': tasks['C']}) == (None, None, None, None)
+
+
 # Add more tests for graphs with cycles (if applicable), already existing START/END nodes etc.
+
+
+def test_topological_layers():
+    """Tests that each node is placed one layer below its deepest predecessor."""
+    G = nx.DiGraph([('A', 'B'), ('B', 'C'), ('A', 'C'), ('D', 'C')])
+    G.add_node('E')
+    assert topological_layers(G) == {'A': 0, 'D': 0, 'E': 0, 'B': 1, 'C': 2}
+
+
+def test_topological_layers_cycle():
+    """Tests that a dependency cycle is reported as a ValueError."""
+    G = nx.DiGraph([('A', 'B'), ('B', 'A')])
+    with pytest.raises(ValueError):
+        topological_layers(G)
@@ -4,14 +4,18 @@ from datetime import datetime, timedelta
 from pathlib import Path  # For easier path handling
 
 # Adjust the import based on your package structure
-from pyganttccpm.loader import load_process_project_data, process_project_data
+from pyganttccpm.loader import (
+    TaskRecord,
+    load_process_project_data,
+    process_project_data,
+)
 from pyganttccpm.config import TaskType
 
 
 # Use pytest fixtures for setup (e.g., creating temporary JSON files)
-@pytest.fixture
-def sample_json_data_standard(tmp_path):
-    """Creates a temporary standard JSON file for testing."""
+@pytest.fixture(scope='module')
+def sample_json_data_standard(tmp_path_factory):
+    """Creates a temporary standard JSON file for testing (once per module, tests only read it)."""
     data = {
         'project_info': {
             'name': 'Test Project',
@@ -58,9 +62,8 @@ def sample_json_data_standard(tmp_path):
             },
         ],
     }
-    file_path = tmp_path / 'test_project.json'
-    with open(file_path, 'w') as f:
-        json.dump(data, f)
+    file_path = tmp_path_factory.mktemp('loader') / 'test_project.json'
+    file_path.write_bytes(json.dumps(data).encode())
     return file_path
 
 
@@ -121,9 +124,9 @@ def test_load_standard_calendar(sample_json_data_standard):
     assert task_d['total_duration'] == timedelta(days=0)
 
 
-@pytest.fixture
-def sample_data_missing_optional(tmp_path):
-    """Creates temporary JSON data missing optional fields."""
+@pytest.fixture(scope='module')
+def sample_data_missing_optional(tmp_path_factory):
+    """Creates temporary JSON data missing optional fields (once per module)."""
     data = {
         'project_info': {
             # 'name': missing -> should default
@@ -147,9 +150,8 @@ def sample_data_missing_optional(tmp_path):
             },
         ],
     }
-    file_path = tmp_path / 'missing_optional.json'
-    with open(file_path, 'w') as f:
-        json.dump(data, f)
+    file_path = tmp_path_factory.mktemp('loader') / 'missing_optional.json'
+    file_path.write_bytes(json.dumps(data).encode())
     return file_path
 
 
@@ -192,19 +194,44 @@ def test_load_missing_optional_fields(sample_data_missing_optional):
     assert len(dependencies) == 0
 
 
-def test_load_missing_file():
-    """Tests behavior when the JSON file doesn't exist."""
-    result = load_process_project_data('non_existent_file.json')
-    assert all(item is None for item in result)
-
-
-def test_load_invalid_json(tmp_path):
-    """Tests behavior with invalid JSON content."""
-    file_path = tmp_path / 'invalid.json'
-    with open(file_path, 'w') as f:
-        f.write('{invalid json content')
+def test_load_without_orjson(sample_json_data_standard, monkeypatch):
+    """Tests the stdlib json fallback gives the same result as orjson."""
+    pytest.importorskip('orjson')
+    import pyganttccpm.loader as loader
+
+    expected = load_process_project_data(sample_json_data_standard)
+    monkeypatch.setattr(loader, 'orjson', None)
+    result = load_process_project_data(sample_json_data_standard)
+    assert result[1] == expected[1]
+    assert result[2] == expected[2]
+
+
+def test_load_nan_literals(tmp_path):
+    """Tests that NaN/Infinity literals load the same with or without orjson."""
+    file_path = tmp_path / 'nan.json'
+    file_path.write_bytes(
+        b'{"project_info": {"start_date": "2025-01-01"}, "tasks": ['
+        b'{"id": 1, "name": "NaN Remaining", "start": 0, "finish": 2, "remaining": NaN},'
+        b'{"id": 2, "name": "Infinite Start", "start": Infinity, "finish": 2}]}'
+    )
+    tasks = load_process_project_data(file_path)[1]
+    assert list(tasks) == ['NaN Remaining']
+    assert tasks['NaN Remaining']['has_remaining_data'] is False
+    assert tasks['NaN Remaining']['total_duration'] == timedelta(days=2)
+
+
+@pytest.mark.parametrize(
+    'content',
+    [None, '{invalid json content'],
+    ids=['missing_file', 'invalid_json'],
+)
+def test_load_bad_input(tmp_path, content):
+    """Tests that a missing file or invalid JSON content loads as all None."""
+    file_path = tmp_path / 'project.json'
+    if content is not None:
+        file_path.write_text(content)
     result = load_process_project_data(file_path)
-    assert all(item is None for item in result)
+    assert result == (None,) * 8
 
 
 def test_load_missing_start_date(tmp_path):
@@ -271,6 +298,115 @@ def test_process_data_missing_optional():
     assert len(dependencies) == 0
 
 
+def test_task_record_reads_like_a_dict():
+    """Tests that processed task records support attribute and mapping access."""
+    tasks = process_project_data(
+        {'start_date': '2025-03-01'},
+        [{'id': 1, 'name': 'Rec', 'start': 0, 'finish': 2, 'chain': 'C'}],
+    )[1]
+    record = tasks['Rec']
+    assert isinstance(record, TaskRecord)
+    assert record.start == record['start'] == datetime(2025, 3, 1)
+    assert record.get('url') is None
+    assert record.get('not_a_field', 'default') == 'default'
+    assert 'chain' in record
+    assert dict(record)['total_duration'] == timedelta(days=2)
+    assert record == dict(record)
+    with pytest.raises(KeyError):
+        record['get']
+
+
+def test_task_record_updates_like_a_dict():
+    """Tests that task record fields can be set, but not added or deleted."""
+    record = process_project_data(
+        {'start_date': '2025-03-01'},
+        [{'id': 1, 'name': 'Rec', 'start': 0, 'finish': 2}],
+    )[1]['Rec']
+    copy = record.copy()
+    record['url'] = 'http://example.com/rec'
+    record.update(resources='R1')
+    assert record.setdefault('chain', 'Other') == 'Unknown'
+    assert (record.url, record.resources) == ('http://example.com/rec', 'R1')
+    assert copy.url is None and copy.resources == ''
+    with pytest.raises(KeyError):
+        record['not_a_field'] = 1
+    with pytest.raises(TypeError):
+        del record['url']
+
+
+def test_process_data_date_formats():
+    """Tests that ISO dates and other dateutil formats are both accepted."""
+    project_info = {
+        'start_date': '2025-03-01T09:30:00',
+        'publish_date': 'March 5, 2025',
+    }
+    start_date, _, _, _, _, _, publish_date, _ = process_project_data(project_info, [])
+    assert start_date == datetime(2025, 3, 1)
+    assert publish_date == datetime(2025, 3, 5)
+
+
+def test_process_data_predecessor_formats():
+    """Tests parsing of valid and invalid predecessor lists."""
+    project_info = {'start_date': '2025-03-01'}
+    tasks_list = [
+        {'id': 1, 'name': 'P1', 'start': 0, 'finish': 1},
+        {'id': 2, 'name': 'P2', 'start': 0, 'finish': 1},
+        {
+            'id': 3,
+            'name': 'Spaced',
+            'start': 1,
+            'finish': 2,
+            'predecessors': ' 1 ,, 2 ,',
+        },
+        {'id': 4, 'name': 'Invalid', 'start': 1, 'finish': 2, 'predecessors': '1, x'},
+        {'id': 5, 'name': 'Unknown', 'start': 1, 'finish': 2, 'predecessors': '99'},
+        {'id': 10, 'name': 'P10', 'start': 0, 'finish': 1},
+        {
+            'id': 6,
+            'name': 'Grouped',
+            'start': 1,
+            'finish': 2,
+            'predecessors': '1_0, +1',
+        },
+        {'id': 7, 'name': 'Bad Group', 'start': 1, 'finish': 2, 'predecessors': '1__0'},
+    ]
+    dependencies = process_project_data(project_info, tasks_list)[2]
+    assert dependencies == [
+        ('P1', 'Spaced'),
+        ('P2', 'Spaced'),
+        ('P10', 'Grouped'),
+        ('P1', 'Grouped'),
+    ]
+
+
+def test_process_data_skips_out_of_range_offsets():
+    """Tests that offsets too large for a date are skipped rather than wrapped."""
+    project_info = {'start_date': '2025-03-01'}
+    tasks_list = [
+        {'id': 1, 'name': 'Huge', 'start': 1e15, 'finish': 1e15 + 1},
+        {'id': 2, 'name': 'Past End', 'start': 3_000_000, 'finish': 3_000_001},
+        {'id': 3, 'name': 'Kept', 'start': 0, 'finish': 2, 'remaining': 1e300},
+    ]
+    tasks = process_project_data(project_info, tasks_list)[1]
+    assert list(tasks) == ['Kept']
+    assert tasks['Kept']['remaining_duration'] == timedelta(days=2)
+    assert tasks['Kept']['completed_duration'] == timedelta(0)
+
+
+def test_process_data_type_names_ignore_case():
+    """Tests that task types are matched case-insensitively."""
+    project_info = {'start_date': '2025-03-01'}
+    tasks_list = [
+        {'id': 1, 'name': 'Upper', 'start': 0, 'finish': 1, 'type': 'BUFFER'},
+        {'id': 2, 'name': 'Lower', 'start': 0, 'finish': 1, 'type': 'critical'},
+        {'id': 3, 'name': 'Unknown', 'start': 0, 'finish': 1, 'type': 'other'},
+    ]
+    tasks = process_project_data(project_info, tasks_list)[1]
+    assert tasks['Upper']['type'] == TaskType.BUFFER
+    assert tasks['Lower']['type'] == TaskType.CRITICAL
+    assert tasks['Unknown']['type'] == TaskType.UNASSIGNED
+
+
 # Add more tests for:
 # - 'continuous' calendar type
 # - Invalid date formats
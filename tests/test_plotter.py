@@ -1,31 +1,53 @@
 import pytest
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
+from matplotlib.collections import PolyCollection
+from matplotlib.patches import FancyArrowPatch
 from datetime import datetime, timedelta
+import io
 import re
 import os
-import pathlib as Path
+from pathlib import Path
 
 # Adjust imports
 from pyganttccpm import plot_project_gantt_with_start_end
-from pyganttccpm.loader import load_process_project_data
+from pyganttccpm.config import TaskType
+from pyganttccpm.loader import TaskRecord
 
-from pyganttccpm.config import TASK_COLORS, TaskType, START_NODE, END_NODE
+REFERENCE_SVG = (
+    Path(__file__).resolve().parent / 'reference' / 'test_plotter_reference_svg.svg'
+)
+
+
+# Parts of the SVG that change between runs (dates, generated ids), removed
+# in a single pass; clipPath openings keep their tag
+_SVG_VOLATILE_RE = re.compile(
+    r'<dc:date>.*?</dc:date>'
+    r'|\sclip-path="url\(#.*?\)"'
+    r'|\sid="m[a-f0-9]{8,}"'
+    r'|\sxlink:href="#m[a-f0-9]{8,}"'
+    r'|\sid="C\d+_\d+_[a-f0-9]{8,}"'
+    r'|\sxlink:href="#C\d+_\d+_[a-f0-9]{8,}"'
+    r'|<clipPath id="p[a-f0-9]{8,}">'
+)
+_SVG_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _replace_volatile(match):
+    return '<clipPath>' if match.group(0).startswith('<clipPath') else ''
 
 
 def sanitize_svg_for_comparison(svg_content: str) -> str:
-    svg_content = re.sub(r'<dc:date>.*?</dc:date>', '', svg_content)
-    svg_content = re.sub(r'\sclip-path="url\(#.*?\)"', '', svg_content)
-    svg_content = re.sub(r'\sid="m[a-f0-9]{8,}"', '', svg_content)
-    svg_content = re.sub(r'\sxlink:href="#m[a-f0-9]{8,}"', '', svg_content)
-    svg_content = re.sub(r'<clipPath id="p[a-f0-9]{8,}">', '<clipPath>', svg_content)
-    svg_content = re.sub(r'\s+', ' ', svg_content).strip()
-    return svg_content
+    svg_content = _SVG_VOLATILE_RE.sub(_replace_volatile, svg_content)
+    return _SVG_WHITESPACE_RE.sub(' ', svg_content).strip()
 
 
-def assert_svg_equivalent(svg_file: str, reference_svg: str, debug_dir: Path = None):
-    with open(svg_file) as f1, open(reference_svg) as f2:
-        svg1 = sanitize_svg_for_comparison(f1.read())
-        svg2 = sanitize_svg_for_comparison(f2.read())
+def assert_svg_equivalent(
+    svg_content: str, reference_svg: str | Path, debug_dir: Path | None = None
+):
+    with open(reference_svg) as f:
+        svg2 = sanitize_svg_for_comparison(f.read())
+    svg1 = sanitize_svg_for_comparison(svg_content)
 
     if debug_dir:
         debug_dir.mkdir(parents=True, exist_ok=True)
@@ -40,9 +62,9 @@ def assert_svg_equivalent(svg_file: str, reference_svg: str, debug_dir: Path = N
 
 
 # Use the same fixture as test_loader or create a minimal one
-@pytest.fixture
+@pytest.fixture(scope='module')
 def minimal_plot_data():
-    """Provides minimal valid data for plotting."""
+    """Provides minimal valid data for plotting (shared; the plotter does not modify it)."""
     start_date = datetime(2025, 1, 1)
     tasks = {
         'Task1': {
@@ -68,43 +90,40 @@ def minimal_plot_data():
     return start_date, tasks, dependencies, stream_map, calendar, name, publish_date
 
 
-def test_plotter_runs_without_error(minimal_plot_data):
+@pytest.fixture(scope='module')
+def built_figure(minimal_plot_data):
+    """Plots minimal_plot_data once for the tests that only inspect or save the figure."""
+    fig = plot_project_gantt_with_start_end(*minimal_plot_data)
+    yield fig
+    plt.close(fig)
+
+
+def test_plotter_runs_without_error(built_figure):
     """Tests if the plotting function executes without raising exceptions."""
-    plt.close('all')  # Close any previous plots
-    try:
-        fig = plot_project_gantt_with_start_end(*minimal_plot_data)
-        assert fig is not None
-        assert isinstance(fig, plt.Figure)
-        # We don't visually inspect the plot here, just check it ran
-    except Exception as e:
-        pytest.fail(f'plot_project_gantt_with_start_end raised an exception: {e}')
-    finally:
-        plt.close('all')  # Clean up the figure
+    # Plotting happened in the fixture; an exception there errors this test
+    assert built_figure is not None
+    assert isinstance(built_figure, plt.Figure)
+    # We don't visually inspect the plot here, just check it ran
 
 
-def test_plotter_reference_svg(minimal_plot_data, tmp_path):
+def test_plotter_reference_svg(built_figure):
     """Tests if the plotting function create SVGs that are visually equivalent to reference file."""
-    plt.close('all')  # Close any previous plots
-    fig = plot_project_gantt_with_start_end(*minimal_plot_data)
-    svg_file = tmp_path / 'test_plotter_reference_svg.svg'
-    fig.savefig(svg_file, format='svg')
+    fig = built_figure
+    # Serialize in memory; only write mode puts the SVG on disk
+    svg_buffer = io.BytesIO()
+    fig.savefig(svg_buffer, format='svg')
 
     # Compare against reference - get path to reference SVG
-    test_dir = os.path.dirname(os.path.abspath(__file__))
-    reference_svg = os.path.join(
-        test_dir, 'reference', 'test_plotter_reference_svg.svg'
-    )
+    reference_svg = REFERENCE_SVG
 
     # Check if we're in write mode - Needed for first run
     write_mode = os.environ.get('TDDA_WRITE_ALL', '0') == '1'
 
     if write_mode:
         # Create the reference directory if it doesn't exist
-        os.makedirs(os.path.dirname(reference_svg), exist_ok=True)
+        reference_svg.parent.mkdir(parents=True, exist_ok=True)
         # Create the reference SVG file
-        import shutil
-
-        shutil.copy2(svg_file, reference_svg)
+        reference_svg.write_bytes(svg_buffer.getvalue())
         pytest.fail(
             f'Created reference SVG file: {reference_svg}. \nSet TDDA_WRITE_ALL=0 to run tests without writing files.'
         )
@@ -114,8 +133,154 @@ def test_plotter_reference_svg(minimal_plot_data, tmp_path):
         assert fig is not None
         assert isinstance(fig, plt.Figure)
         # Compare against the reference file
-        assert_svg_equivalent(svg_file, reference_svg)
+        assert_svg_equivalent(svg_buffer.getvalue().decode(), reference_svg)
     except Exception as e:
         pytest.fail(f'test_plotter_reference_svg raised an exception: {e}')
-    finally:
-        plt.close('all')  # Clean up the figure
+
+
+def test_plotter_skips_labels_of_narrow_bars(minimal_plot_data):
+    """Tests that min_label_px drops labels of bars narrower than the threshold."""
+    plt.close('all')
+
+    def label_texts(fig):
+        return [text.get_text() for text in fig.axes[0].texts]
+
+    fig = plot_project_gantt_with_start_end(*minimal_plot_data)
+    assert '1 Task1 (R)' in label_texts(fig)
+
+    fig = plot_project_gantt_with_start_end(*minimal_plot_data, min_label_px=1)
+    assert '1 Task1 (R)' in label_texts(fig)
+
+    fig = plot_project_gantt_with_start_end(*minimal_plot_data, min_label_px=10_000)
+    assert '1 Task1 (R)' not in label_texts(fig)
+    # START/END labels are not affected
+    assert 'START' in label_texts(fig)
+
+    # Thresholds just around the bar's width in the finished figure, which the
+    # legend margin makes narrower than the axes are while plotting
+    ax = plot_project_gantt_with_start_end(*minimal_plot_data).axes[0]
+    bar_px = (
+        ax.transData.transform((mdates.date2num(datetime(2025, 1, 5)), 0))[0]
+        - ax.transData.transform((mdates.date2num(datetime(2025, 1, 1)), 0))[0]
+    )
+    fig = plot_project_gantt_with_start_end(*minimal_plot_data, min_label_px=bar_px - 1)
+    assert '1 Task1 (R)' in label_texts(fig)
+    fig = plot_project_gantt_with_start_end(*minimal_plot_data, min_label_px=bar_px + 1)
+    assert '1 Task1 (R)' not in label_texts(fig)
+    plt.close('all')
+
+
+def test_plotter_merges_weekend_shading(minimal_plot_data):
+    """Tests that each weekend is shaded by one span in a single collection."""
+    plt.close('all')
+    fig = plot_project_gantt_with_start_end(*minimal_plot_data)
+    ax = fig.axes[0]
+    shading = [c for c in ax.collections if c.get_zorder() == -1]
+    assert len(shading) == 1
+    # Plot range is 2024-12-31 .. 2025-01-06; the only weekend is Jan 4-5
+    (span,) = shading[0].get_paths()
+    x_min, _ = span.vertices.min(axis=0)
+    x_max, _ = span.vertices.max(axis=0)
+    assert mdates.num2date(x_min).replace(tzinfo=None) == datetime(2025, 1, 4)
+    assert x_max - x_min == 2
+    plt.close('all')
+
+
+def test_plotter_rasterizes_bars_above_threshold(minimal_plot_data, tmp_path):
+    """Tests that bars are embedded as an image only above rasterize_bars_above."""
+    plt.close('all')
+
+    def bar_collections(fig):
+        return [
+            c
+            for c in fig.axes[0].collections
+            if isinstance(c, PolyCollection) and c.get_zorder() in (2, 3)
+        ]
+
+    fig = plot_project_gantt_with_start_end(*minimal_plot_data, rasterize_bars_above=1)
+    assert not any(c.get_rasterized() for c in bar_collections(fig))
+
+    fig = plot_project_gantt_with_start_end(*minimal_plot_data, rasterize_bars_above=0)
+    assert all(c.get_rasterized() for c in bar_collections(fig))
+    svg_file = tmp_path / 'rasterized.svg'
+    fig.savefig(svg_file, format='svg')
+    assert '<image' in svg_file.read_text()
+    plt.close('all')
+
+
+def test_plotter_topological_lanes(minimal_plot_data):
+    """Tests that lane_layout='topological' places tasks by dependency layer."""
+    plt.close('all')
+    fig = plot_project_gantt_with_start_end(
+        *minimal_plot_data, lane_layout='topological'
+    )
+    ax = fig.axes[0]
+    labels = [label.get_text() for label in ax.get_yticklabels()]
+    assert labels == ['Layer 2', 'Layer 1', 'Layer 0']  # END, Task1, START
+    assert ax.get_ylabel() == 'Dependency Layer'
+
+    with pytest.raises(ValueError):
+        plot_project_gantt_with_start_end(*minimal_plot_data, lane_layout='bogus')
+    plt.close('all')
+
+
+def test_plotter_leaves_inputs_unmodified(minimal_plot_data):
+    """Tests that adding START/END nodes does not change the caller's data."""
+    plt.close('all')
+    _, tasks, dependencies, stream_map, *_ = minimal_plot_data
+    plot_project_gantt_with_start_end(*minimal_plot_data)
+    assert list(tasks) == ['Task1']
+    assert dependencies == []
+    assert stream_map == {'Task1': 'C1'}
+    plt.close('all')
+
+
+def test_plotter_arrow_leaves_end_without_total_duration():
+    """Tests that a task without 'total_duration' sends its arrows from its end."""
+    plt.close('all')
+    tasks = {
+        'A': {'start': datetime(2025, 1, 1), 'end': datetime(2025, 1, 5)},
+        'B': {'start': datetime(2025, 1, 8), 'end': datetime(2025, 1, 10)},
+    }
+    fig = plot_project_gantt_with_start_end(
+        datetime(2025, 1, 1),
+        tasks,
+        [('A', 'B')],
+        {'A': 'C1', 'B': 'C2'},
+        'standard',
+        'No Durations',
+        None,
+        add_start_end_nodes=False,
+    )
+    (arrow,) = [p for p in fig.axes[0].patches if isinstance(p, FancyArrowPatch)]
+    x_start = arrow.get_path().vertices[0][0]  # Data coordinates, shrunk by ~2 points
+    assert x_start == pytest.approx(mdates.date2num(datetime(2025, 1, 5)), abs=0.2)
+    plt.close('all')
+
+
+def test_plotter_reads_task_records(minimal_plot_data):
+    """Tests that TaskRecords plot the same labels and URLs as task dicts."""
+    start_date, tasks, *rest = minimal_plot_data
+    records = {
+        name: TaskRecord(predecessors_str='', **data) for name, data in tasks.items()
+    }
+
+    def labels_and_urls(fig):
+        bars = fig.axes[0].collections[0]
+        return [text.get_text() for text in fig.axes[0].texts], bars.get_urls()
+
+    dict_fig = plot_project_gantt_with_start_end(*minimal_plot_data)
+    record_fig = plot_project_gantt_with_start_end(start_date, records, *rest)
+    assert labels_and_urls(record_fig) == labels_and_urls(dict_fig)
+    plt.close('all')
+
+
+def test_plotter_skips_tk_setup_for_agg(minimal_plot_data, monkeypatch):
+    """Tests that plotting with a non-Tk backend never probes Tk."""
+    import pyganttccpm.plotter as plotter
+
+    calls = []
+    monkeypatch.setattr(plotter, 'configure_tk', lambda: calls.append(True))
+    monkeypatch.setattr(plotter, '_tk_configured', False)
+    plt.close(plot_project_gantt_with_start_end(*minimal_plot_data))
+    assert calls == []